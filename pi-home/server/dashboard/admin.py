@@ -1,10 +1,11 @@
 from django.contrib import admin
-from dashboard.models.photos import SourceImage, Variant
-from dashboard.models.job import Job, Execution, JobLogEntry
+from dashboard.models.photos import SourceImage, Variant, IndexedDirectory, IndexedFile
+from dashboard.models.job import Job, Execution, JobLogEntry, ExecutionDailyRollup
 from dashboard.models.weather import Location, WeatherDetail, DayForecast
 from dashboard.models.application import MinuteSystemSample, PrerenderedDashboard
 from dashboard.models.calendar import CalendarSource, CalendarOccurrence
 from dashboard.models.schedule import Display, WeeklyRule
+from dashboard.jobs.job_registry import enqueue_execution
 
 @admin.register(SourceImage)
 class SourceImageAdmin(admin.ModelAdmin):
@@ -25,12 +26,31 @@ class RenderedAssetAdmin(admin.ModelAdmin):
     list_filter = ("art_style","content_type","photorealist","favourite","source_quality")
     search_fields = ("path", "art_style",)
     readonly_fields = ("source_image", "created_at", "updated_at")
+@admin.register(IndexedFile)
+class IndexedFileAdmin(admin.ModelAdmin):
+    list_display = ["path", "size", "sha256", "source_image", "updated_at"]
+    search_fields = ("path", "sha256")
+    readonly_fields = [f.name for f in IndexedFile._meta.fields]
+
+@admin.register(IndexedDirectory)
+class IndexedDirectoryAdmin(admin.ModelAdmin):
+    list_display = ["path", "mtime_ns", "updated_at"]
+    search_fields = ("path",)
+    readonly_fields = [f.name for f in IndexedDirectory._meta.fields]
+
 @admin.register(Job)
 class JobAdmin(admin.ModelAdmin):
     list_display = [f.name for f in Job._meta.fields]
     list_filter = ("enabled", "kind", "last_run_status")
     search_fields = ("name",)
-    readonly_fields = ("created_at", "updated_at")
+    readonly_fields = ("next_fire_at", "created_at", "updated_at")
+    actions = ["run_now"]
+
+    @admin.action(description="Run selected jobs now")
+    def run_now(self, request, queryset):
+        for job in queryset:
+            enqueue_execution(job)
+        self.message_user(request, f"Queued {queryset.count()} job(s).")
 
 @admin.register(Execution)
 class ExecutionAdmin(admin.ModelAdmin):
@@ -47,6 +67,12 @@ class JobLogEntryAdmin(admin.ModelAdmin):
     search_fields = ("message",)
     readonly_fields = ["execution","ts","level","message","context","seq","created_at"]
 
+@admin.register(ExecutionDailyRollup)
+class ExecutionDailyRollupAdmin(admin.ModelAdmin):
+    list_display = [f.name for f in ExecutionDailyRollup._meta.fields] + ["success_rate"]
+    list_filter = ("kind",)
+    readonly_fields = [f.name for f in ExecutionDailyRollup._meta.fields]
+
 @admin.register(Location)
 class LocationAdmin(admin.ModelAdmin):
     list_display = [f.name for f in Location._meta.fields]
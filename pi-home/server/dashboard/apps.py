@@ -10,4 +10,10 @@ class DashboardConfig(AppConfig):
     def ready(self) -> None:
         import dashboard.jobs.classify
         import dashboard.jobs.generate_variant
+        import dashboard.jobs.dummy_job
+        import dashboard.jobs.get_weather
+        import dashboard.jobs.calendar
+        import dashboard.jobs.generate_dashboard
+        import dashboard.jobs.retention
+        import dashboard.services.select_image  # connects sampler invalidation signals
         return super().ready()
@@ -168,3 +168,25 @@ NATIVE_WITH_SKIN_PALETTE = {
 }
 
 NATIVE_WITH_SKIN_PALETTE_SET = extract_rgb_set(NATIVE_WITH_SKIN_PALETTE)
+
+
+# Palette names, as used in pipeline declarations. The Palette objects built
+# from these live in services.palette.
+NATIVE = "native"
+EXTENDED = "extended"
+SHADED = "shaded"
+NATIVE_WITH_SKIN = "native_with_skin"
+
+PALETTES: Dict[str, Dict[str, Any]] = {
+    NATIVE: NATIVE_PALETTE,
+    EXTENDED: EXTENDED_PALETTE,
+    SHADED: SHADED_PALETTE,
+    NATIVE_WITH_SKIN: NATIVE_WITH_SKIN_PALETTE,
+}
+
+PALETTE_CHOICES = [
+    (NATIVE, "Native"),
+    (EXTENDED, "Extended"),
+    (SHADED, "Shaded"),
+    (NATIVE_WITH_SKIN, "Native with skin tones"),
+]
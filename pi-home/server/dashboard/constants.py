@@ -33,6 +33,8 @@ ENV_PATH = PI_DIR / ".env.server"
 SECRETS = parse_env_file(ENV_PATH)
 
 IMAGE_DIR = Path(SECRETS["IMAGE_DIR"])
+# Derived, disposable files (encoded payloads, proxies); safe to wipe at any time
+CACHE_DIR = Path(SECRETS.get("CACHE_DIR", PROJECT_DIR / "cache"))
 ICAL_GOOGLE_CALENDAR_URL = SECRETS["ICAL_GOOGLE_CALENDAR_URL"]
 OPENAI_KEY = SECRETS["OPENAI_KEY"]
 OPENWEATHERMAP_KEY = SECRETS["OPENWEATHERMAP_KEY"]
@@ -40,11 +42,33 @@ OPENAI_PORTRAIT_SIZE= "1024x1536"
 OPENAI_SQUARE_SIZE= "1024x1024"
 OPENAI_LANDSCAPE_SIZE= "1536x1024"
 IMAGE_ART_GENERATION_MODEL="gpt-5"
+# With detail "high" OpenAI fits images within 2048x2048 and then scales the
+# short side down to 768px; anything larger is uploaded only to be discarded.
+OPENAI_INPUT_MAX_SHORT_SIDE = 768
+OPENAI_INPUT_MAX_LONG_SIDE = 2048
+OPENAI_INPUT_JPEG_QUALITY = 85
+OPENAI_PAYLOAD_CACHE_BYTES = 256 * 1024 * 1024
+# Decoded, EXIF-transposed working copies of source images, by long side.
+# A pipeline gets the smallest one that still covers what its first step needs.
+PROXY_LONG_SIDES = (512, 1024, 2048, 4096)
+PROXY_CACHE_BYTES = 1024 * 1024 * 1024
+# Quantized bootscreens, keyed by a hash of what they show
+BOOTSCREEN_CACHE_BYTES = 64 * 1024 * 1024
 
 NEWS_MODE = "news"
 PHOTO_MODE = "photo"
 DASHBOARD_MODE = "dashboard"
 
+# Longest a frame is told to sleep in each mode when no schedule boundary
+# comes sooner; content within a mode still changes (new photo, fresh dashboard)
+MODE_REFRESH_SECS = {
+    NEWS_MODE: 6 * 60 * 60,
+    PHOTO_MODE: 60 * 60,
+    DASHBOARD_MODE: 15 * 60,
+}
+# Never ask a frame to wake again sooner than this
+MIN_SLEEP_SECS = 60
+
 MODE_CHOICES = [
     (NEWS_MODE, "Newspaper"),
     (PHOTO_MODE, "Photo"),
@@ -52,11 +76,21 @@ MODE_CHOICES = [
 ]
 
 ModeKind: TypeAlias = Literal[
-    "NEWS_MODE",
-    "PHOTO_MODE",
-    "DASHBOARD_MODE"
+    "news",
+    "photo",
+    "dashboard"
+]
+
+BROWSER_RENDERER = "browser"
+PILLOW_RENDERER = "pillow"
+
+DASHBOARD_RENDERER_CHOICES = [
+    (BROWSER_RENDERER, "Headless browser (HTML page)"),
+    (PILLOW_RENDERER, "Pillow (drawn directly)"),
 ]
 
+DashboardRenderer: TypeAlias = Literal["browser", "pillow"]
+
 WEEKDAY_CHOICES = [
     (0, "Mon"),
     (1, "Tue"),
@@ -94,6 +128,7 @@ CLASSIFY = "CLASSIFY"
 MANUAL_TRIGGER = "MANUAL_TRIGGER"
 DASHBOARD = "DASHBOARD"
 DUMMY = "DUMMY"
+RETENTION = "RETENTION"
 
 JOB_KIND_CHOICES = [
     (CALENDAR, "Get calendar"),
@@ -105,7 +140,8 @@ JOB_KIND_CHOICES = [
     (CLASSIFY, "Classify image"),
     (MANUAL_TRIGGER, "Manually triggered"),
     (DASHBOARD, "Generate dashboard"),
-    (DUMMY, "Dummy job to test the scheduler and the commands")
+    (DUMMY, "Dummy job to test the scheduler and the commands"),
+    (RETENTION, "Prune and roll up old executions and logs"),
 ]
 
 JobKind: TypeAlias = Literal[
@@ -119,8 +155,34 @@ JobKind: TypeAlias = Literal[
     "MANUAL_TRIGGER",
     "DUMMY",
     "DASHBOARD",
+    "RETENTION",
 ]
 
+# Worker threads per job kind in the daemon. Kinds not listed share one pool
+# of DEFAULT_JOB_CONCURRENCY workers.
+JOB_KIND_CONCURRENCY: Dict[str, int] = {
+    ART: 1,
+    CLASSIFY: 4,
+    DASHBOARD: 1,
+}
+DEFAULT_JOB_CONCURRENCY = 2
+
+# Retention (days) per job kind. Log lines go first; executions older than
+# their TTL are rolled up into ExecutionDailyRollup rows and then deleted.
+JOB_LOG_RETENTION_DAYS: Dict[str, int] = {
+    DUMMY: 1,
+    CLASSIFY: 7,
+}
+DEFAULT_JOB_LOG_RETENTION_DAYS = 14
+EXECUTION_RETENTION_DAYS: Dict[str, int] = {
+    DUMMY: 2,
+    CLASSIFY: 14,
+}
+DEFAULT_EXECUTION_RETENTION_DAYS = 60
+# Rendered dashboards (rows and files) older than this are deleted, except the
+# newest one for each renderer, geometry and palette
+DASHBOARD_RETENTION_HOURS = 24
+
 RUNNING = "RUNNING"
 SUCCESS = "SUCCESS"
 SKIPPED = "SKIPPED"
@@ -0,0 +1,99 @@
+from __future__ import annotations
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, Dict, Mapping, Optional
+
+from django.db import close_old_connections
+from django.utils import timezone
+
+from dashboard.constants import ERROR, JOB_KIND_CONCURRENCY, DEFAULT_JOB_CONCURRENCY
+from dashboard.models.job import Execution
+from dashboard.jobs.job_registry import run_execution
+
+SHARED_POOL = "SHARED"
+
+
+class _Pool:
+    """A thread pool plus an in-flight counter so we never over-claim work."""
+
+    def __init__(self, name: str, size: int):
+        self.name = name
+        self.size = size
+        self.in_flight = 0
+        self.executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"job-{name.lower()}")
+
+    def free_slots(self) -> int:
+        return max(0, self.size - self.in_flight)
+
+
+class JobExecutor:
+    """
+    Runs executions on per-kind worker pools.
+
+    Kinds listed in `concurrency` get a dedicated pool of that size; every other
+    kind shares one pool of `default_concurrency` workers. Handlers are mostly
+    I/O bound (OpenAI, HTTP, Playwright) so threads are enough to overlap them.
+    Callers must only submit executions for which `free_slots()` is positive;
+    an execution marked RUNNING should really be running, not waiting in a pool.
+    """
+
+    def __init__(
+        self,
+        concurrency: Mapping[str, int] = JOB_KIND_CONCURRENCY,
+        default_concurrency: int = DEFAULT_JOB_CONCURRENCY,
+        on_finished: Optional[Callable[[], None]] = None,
+    ):
+        self._lock = threading.Lock()
+        self._pools: Dict[str, _Pool] = {
+            kind: _Pool(kind, size) for kind, size in concurrency.items() if size > 0
+        }
+        self._shared = _Pool(SHARED_POOL, max(1, default_concurrency))
+        self._on_finished = on_finished
+
+    def _pool_for(self, kind: str) -> _Pool:
+        return self._pools.get(kind, self._shared)
+
+    def free_slots(self, kind: str) -> int:
+        with self._lock:
+            return self._pool_for(kind).free_slots()
+
+    def reserve(self, kind: str) -> bool:
+        """Take a slot for `kind` if one is free. Pair with `submit` or `release`."""
+        with self._lock:
+            pool = self._pool_for(kind)
+            if pool.free_slots() <= 0:
+                return False
+            pool.in_flight += 1
+            return True
+
+    def release(self, kind: str) -> None:
+        with self._lock:
+            pool = self._pool_for(kind)
+            pool.in_flight = max(0, pool.in_flight - 1)
+
+    def submit(self, execution: Execution) -> Future:
+        """Run an already reserved, RUNNING execution on its kind's pool."""
+        kind = execution.job.kind
+        pool = self._pool_for(kind)
+        return pool.executor.submit(self._run, execution, kind)
+
+    def _run(self, execution: Execution, kind: str) -> None:
+        close_old_connections()
+        try:
+            run_execution(execution)  # sets finished_at + status SUCCESS/ERROR
+        except Exception as err:
+            # Defensive fallback if run_execution didn't catch
+            Execution.objects.filter(pk=execution.pk).update(
+                status=ERROR,
+                finished_at=timezone.now(),
+                error=str(err)[:1000],
+            )
+        finally:
+            close_old_connections()
+            self.release(kind)
+            if self._on_finished:
+                self._on_finished()
+
+    def shutdown(self, wait: bool = False) -> None:
+        for pool in [*self._pools.values(), self._shared]:
+            pool.executor.shutdown(wait=wait, cancel_futures=True)
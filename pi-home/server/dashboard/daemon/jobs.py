@@ -1,120 +1,169 @@
-from datetime import timedelta, datetime
-from dashboard.constants import RUNNING, QUEUED, CRON
+from datetime import datetime
+from dashboard.constants import RUNNING, QUEUED, CRON, ERROR
 
 from django.db import transaction, close_old_connections
-from django.db.models import Exists, OuterRef, Q
+from django.db.models import Exists, OuterRef
 from django.utils import timezone
-from croniter import croniter
 
 from dashboard.models.job import Job, Execution
-from dashboard.jobs.job_registry import run_execution
+from dashboard.services.job_wakeup import JOB_WAKEUP_PORT, WAKEUP_MESSAGE
+from .executor import JobExecutor
 from .time_util import sleep_until_next_minute, next_minute_start
-from daemon import time_util
 import asyncio
 
 ACTIVE_STATUSES = [RUNNING, QUEUED]
 
-def _cron_due_this_minute(expr: str, now: datetime) -> bool:
-    """True if cron expr fires at 'now' (minute precision)."""
-    base = now.replace(second=0, microsecond=0)
-    prev = croniter(expr, base + timedelta(minutes=1)).get_prev(datetime)
-    return prev == base
-
-def find_eligible_jobs(now: datetime) -> list[Job]:
-    base_minute = now.replace(second=0, microsecond=0)
-
+def find_due_jobs(now: datetime) -> list[Job]:
+    """Cron jobs whose precomputed fire time has passed. One indexed query, no cron parsing."""
     active_execs = Execution.objects.filter(
         job=OuterRef("pk"),
         status__in=ACTIVE_STATUSES,
     )
-
-    qs = (
+    return list(
         Job.objects
-        .filter(cron__isnull=False, enabled=True, job_type=CRON)
-        .filter(Q(last_run_finished_at__isnull=True) | Q(last_run_finished_at__lt=base_minute))
+        .filter(job_type=CRON, enabled=True, next_fire_at__lte=now)
         .annotate(active_exists=Exists(active_execs))
-        .filter(active_exists=False)  # push to SQL
     )
 
-    # Cron match done in Python (minute precision)
-    return [j for j in qs if _cron_due_this_minute(j.cron or "", now)]
-
 def queue_due_jobs(now: datetime):
-    base_minute = now.replace(second=0, microsecond=0)
-    due = find_eligible_jobs(now)
+    due = find_due_jobs(now)
     if not due:
         return
 
-    due_ids = [j.pk for j in due]
-
     with transaction.atomic():
-        # Lock the Job rows we plan to touch to prevent duplicate enqueues
-        (Job.objects
-            .select_for_update()
-            .filter(pk__in=due_ids)
-            .order_by("pk")
-            .exists())  # materialize the lock
-
-        for job in Job.objects.in_bulk(due_ids).values():
-            already_running = Execution.objects.filter(
-                job=job, status__in=ACTIVE_STATUSES
-            ).exists()
-            finished_this_minute = (
-                job.last_run_finished_at is not None
-                and job.last_run_finished_at >= base_minute
-            )
-            if not already_running and not finished_this_minute:
+        for job in due:
+            # A fire that lands while the previous run is still active is
+            # skipped, not deferred; either way the index moves on.
+            if not job.active_exists:
                 Execution.objects.create(
                     job=job,
                     status=QUEUED,
                     params=job.params or {},
                 )
+            Job.objects.filter(pk=job.pk).update(
+                next_fire_at=job.compute_next_fire_at(after=now),
+            )
+
+
+def fail_orphaned_executions() -> int:
+    """
+    Executions left RUNNING by a previous daemon process can never finish.
+    Mark them as errored so they stop counting as active for their job.
+    """
+    return Execution.objects.filter(status=RUNNING).update(
+        status=ERROR,
+        finished_at=timezone.now(),
+        error="Daemon restarted while this execution was running.",
+    )
+
+
+def claim_queued_executions(executor: JobExecutor) -> list[Execution]:
+    """
+    Mark as many QUEUED executions RUNNING as the executor has free slots for,
+    oldest first, and return them. Kinds without a free slot stay QUEUED.
+    """
+    claimed: list[Execution] = []
+    try:
+        with transaction.atomic():
+            qs = (
+                Execution.objects
+                .select_related("job")
+                .select_for_update(skip_locked=True)
+                .filter(status=QUEUED)
+                .order_by("created_at")
+            )
+            now = timezone.now()
+            for e in qs:
+                if not executor.reserve(e.job.kind):
+                    continue
+                claimed.append(e)
+                # Mark RUNNING inside txn so others can't claim them
+                e.status = RUNNING
+                e.started_at = now
+                e.save(update_fields=["status", "started_at"])
+    except Exception:
+        for e in claimed:
+            executor.release(e.job.kind)
+        raise
+    return claimed
+
+
+class _WakeupProtocol(asyncio.DatagramProtocol):
+    """Sets the claim loop's event when someone enqueues an execution."""
+
+    def __init__(self, wakeup: asyncio.Event):
+        self.wakeup = wakeup
+
+    def datagram_received(self, data, addr):
+        if data.strip() == WAKEUP_MESSAGE:
+            self.wakeup.set()
 
 
 async def job_execution_task():
-    while True:
-        minute_start = await sleep_until_next_minute()
+    """
+    Claim loop for the Execution queue.
+
+    Cron evaluation stays aligned to wall-clock minutes, but claiming runs
+    whenever something wakes the loop: a minute tick, a datagram from
+    `notify_job_daemon` (admin, `manage.py job --enqueue`) or a finished
+    execution freeing a slot.
+    """
+    loop = asyncio.get_running_loop()
+    wakeup = asyncio.Event()
+    # A finished execution frees a slot; look at the queue again right away
+    executor = JobExecutor(on_finished=lambda: loop.call_soon_threadsafe(wakeup.set))
+
+    def recover():
+        close_old_connections()
+        try:
+            orphaned = fail_orphaned_executions()
+            if orphaned:
+                print(f"Marked {orphaned} orphaned execution(s) as failed.")
+        finally:
+            close_old_connections()
 
-        def work():
+    def work(minute_start: datetime | None):
+        close_old_connections()
+        try:
+            if minute_start is not None:
+                queue_due_jobs(minute_start)
+            claimed = claim_queued_executions(executor)
+        finally:
             close_old_connections()
+        # Run outside the transaction, each on its kind's pool
+        for e in claimed:
+            executor.submit(e)
+
+    pending_minute: datetime | None = None
+
+    async def minute_ticks():
+        nonlocal pending_minute
+        while True:
+            pending_minute = await sleep_until_next_minute()
+            wakeup.set()
+
+    await asyncio.to_thread(recover)
+    try:
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: _WakeupProtocol(wakeup),
+            local_addr=("127.0.0.1", JOB_WAKEUP_PORT),
+        )
+    except OSError as e:
+        transport = None
+        print(f"[job_execution] wakeup listener unavailable, polling per minute only: {e!r}")
+    ticker = asyncio.create_task(minute_ticks(), name="jobs-minute")
+    wakeup.set()  # pick up anything queued while the daemon was down
+    try:
+        while True:
+            await wakeup.wait()
+            wakeup.clear()
+            minute_start, pending_minute = pending_minute, None
             try:
-                queue_due_jobs(minute_start)
-
-                # Single-runner policy: if anything is RUNNING, skip this minute
-                if Execution.objects.filter(status=RUNNING).exists():
-                    print("A job is still running; try again next minute.")
-                    return
-
-                # Claim queued jobs atomically
-                with transaction.atomic():
-                    qs = (
-                        Execution.objects
-                        .select_related("job")
-                        .select_for_update(skip_locked=True)
-                        .filter(status=QUEUED)
-                        .order_by("created_at")
-                    )
-                    executions = list(qs)
-                    # Mark RUNNING inside txn so others can't claim them
-                    now = timezone.now()
-                    for e in executions:
-                        e.status = RUNNING
-                        e.started_at = now
-                        e.save(update_fields=["status", "started_at"])
-
-                # Run outside the transaction, serially, in order
-                for e in executions:
-                    try:
-                        run_execution(e)  # must set finished_at + status DONE/FAILED
-                    except Exception as err:
-                        # Defensive fallback if run_execution didn’t catch
-                        Execution.objects.filter(pk=e.pk).update(
-                            status="FAILED",
-                            finished_at=timezone.now(),
-                            error=str(err)[:1000],
-                        )
-            finally:
-                close_old_connections()
-
-        await asyncio.to_thread(work)
-
+                await asyncio.to_thread(work, minute_start)
+            except Exception as e:
+                print(f"[job_execution] error: {e!r}")
+    finally:
+        ticker.cancel()
+        if transport is not None:
+            transport.close()
+        executor.shutdown(wait=False)
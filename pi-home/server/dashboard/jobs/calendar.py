@@ -24,8 +24,10 @@ def get_calendar(_, logger: RunLogger, params=CalendarJobParams):
     sources = CalendarSource.objects.filter(active=True)
 
     for source in sources:
+        # Fetch before opening the transaction; only the upserts hold the write lock
+        events = list(service.get_calendar(source.ics_url, start_day, end))
         with transaction.atomic():
-            for e in service.get_calendar(source.ics_url, start_day,end):
+            for e in events:
                 CalendarOccurrence.objects.update_or_create(
                     source=source,
                     uid=e.uid,
@@ -1,79 +1,193 @@
 from __future__ import annotations
 
-import os
 import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+from pydantic import BaseModel, PositiveInt
 
 from dashboard.models.job import Job
-from dashboard.models.photos import SourceImage
+from dashboard.models.photos import SourceImage, IndexedFile
 from dashboard.services.logger_job import RunLogger
 from dashboard.constants import (
     IMAGE_DIR,
-    IMAGE_EXTENSIONS,
 )
-from dashboard.services.classify_image import classify_image
+from dashboard.services.classify_image import classify_image, ImageClassification
+from dashboard.services.file_index import (
+    scan_image_dir,
+    files_to_classify,
+    ensure_hashed,
+    is_duplicate,
+    DuplicateFinder,
+)
+from dashboard.services.image_processing import perceptual_hash, image_oriented_size
 from dashboard.jobs.job_registry import register
-from PIL import Image
 import json
 
 
-def find_files() -> set[str]:
-    """Return absolute paths of images in IMAGE_DIR (no subdirs)."""
+def is_portrait(path: str) -> bool:
+    w, h = image_oriented_size(path)  # header only, honours EXIF rotation
+    return h >= w * 1.2  # e.g. portrait if height is at least 20% greater
+
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+MAX_ATTEMPTS = 5
+BACKOFF_BASE_SECS = 2.0
+BACKOFF_MAX_SECS = 60.0
+
+
+class ClassifyJobParams(BaseModel):
+    # Images classified per run
+    max_num_to_classify: PositiveInt = 1
+    # Parallel OpenAI requests
+    concurrency: PositiveInt = 4
+    # Re-stat every file instead of skipping directories whose mtime is unchanged
+    full_rescan: bool = False
+
+
+class _Backoff:
+    """
+    Shared pause for all workers of one run. A 429 means the account is
+    over its limit, so every worker waits, not just the one that got it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+
+    def wait(self):
+        while True:
+            with self._lock:
+                delay = self._resume_at - time.monotonic()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def pause(self, secs: float):
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + secs)
+
+
+def _retry_after_secs(err: Exception, attempt: int) -> float:
+    response = getattr(err, "response", None)
+    header = response.headers.get("retry-after") if response is not None else None
     try:
-        entries = os.listdir(IMAGE_DIR)
-    except FileNotFoundError:
-        return set()
+        if header is not None:
+            return min(float(header), BACKOFF_MAX_SECS)
+    except ValueError:
+        pass
+    return min(BACKOFF_BASE_SECS * 2 ** attempt, BACKOFF_MAX_SECS) * random.uniform(0.8, 1.2)
 
-    files = set()
-    for f in entries:
-        full = os.path.join(IMAGE_DIR, f)
-        if os.path.isfile(full) and os.path.splitext(f)[1].lower() in IMAGE_EXTENSIONS:
-            files.add(full)
-    return files
 
+def classify_with_backoff(path: str, sha256: str | None, backoff: _Backoff) -> ImageClassification | None:
+    """Runs on a worker thread: no database access."""
+    for attempt in range(MAX_ATTEMPTS):
+        backoff.wait()
+        try:
+            return classify_image(path, sha256)
+        except RETRYABLE_ERRORS as e:
+            if attempt == MAX_ATTEMPTS - 1:
+                raise
+            backoff.pause(_retry_after_secs(e, attempt))
+
+
+@dataclass
+class _Candidate:
+    file: IndexedFile
+    phash: str | None
+    duplicates: list[IndexedFile] = field(default_factory=list)
 
-def is_portrait(path: str) -> bool:
-    with Image.open(path) as img:
-        w, h = img.size
-    return h >= w * 1.2  # e.g. portrait if height is at least 20% greater
 
-def classify_new_image(path: str, logger: RunLogger, params: dict | None):
-    classification = None
+def _phash_or_none(path: str) -> str | None:
     try:
-        classification = classify_image(path)
-    except Exception as e:
-        logger.error(f"Classification of image with path \"{path}\" failed. OpenAI error.\n{json.dumps(e)}")
-        return
-    if classification is None:
-        return
+        return perceptual_hash(path)
+    except Exception:
+        return None
+
+
+def pick_candidates(batch: list[IndexedFile], finder: DuplicateFinder, logger: RunLogger) -> list[_Candidate]:
+    """
+    Drop files that duplicate an existing SourceImage (they are linked to it
+    right away) and fold duplicates within the batch into one candidate.
+    """
+    candidates: list[_Candidate] = []
+    for f in batch:
+        phash = _phash_or_none(f.path)
+        existing = finder.find(f.sha256, phash)
+        if existing is not None:
+            IndexedFile.objects.filter(pk=f.pk).update(source_image_id=existing)
+            logger.info(f"Image with path \"{f.path}\" duplicates source image id:{existing}; reusing its classification")
+            logger.incr("duplicates")
+            continue
+        leader = next((c for c in candidates if is_duplicate(c.file.sha256, c.phash, f.sha256, phash)), None)
+        if leader is not None:
+            leader.duplicates.append(f)
+            continue
+        candidates.append(_Candidate(f, phash))
+    return candidates
+
+
+def save_classification(candidate: _Candidate, classification: ImageClassification, logger: RunLogger) -> SourceImage:
+    path = candidate.file.path
     serialisable_classification = classification.model_dump()
     source_image, _ = SourceImage.objects.get_or_create(
         path=path,
-        classification=serialisable_classification,
-        has_variants=False,
+        defaults={
+            "classification": serialisable_classification,
+            "has_variants": False,
+            "sha256": candidate.file.sha256,
+            "phash": candidate.phash,
+        },
     )
+    IndexedFile.objects.filter(
+        pk__in=[candidate.file.pk, *(f.pk for f in candidate.duplicates)],
+    ).update(source_image=source_image)
+    if candidate.duplicates:
+        logger.info(f"Also linked {len(candidate.duplicates)} duplicate(s) of \"{path}\": {', '.join(f.path for f in candidate.duplicates)}")
     logger.info(f"Image with path \"{path}\"\nSource image id:{source_image.pk}\nclassification:\n{json.dumps(serialisable_classification, indent=4)}")
+    return source_image
 
 
-@register("CLASSIFY")
-def classify_images(job: Job, logger: RunLogger, params: dict | None):
-    max_num_to_classify = int((params or {}).get("max_num_to_classify", 1))
-    if max_num_to_classify <= 0:
-        logger.warn("Nothing to do: max_num_to_generate <= 0")
-        return
-    fs_paths: set[str] = find_files()
-    db_paths: set[str] = set(SourceImage.objects.values_list("path", flat=True))
-
-    unprocessed_paths = list(fs_paths - db_paths)
-    random.shuffle(unprocessed_paths)
+@register("CLASSIFY", ClassifyJobParams)
+def classify_images(job: Job, logger: RunLogger, params: ClassifyJobParams):
+    scan = scan_image_dir(IMAGE_DIR, full=params.full_rescan)
+    logger.debug(f"File index updated: {scan}")
 
-    to_process = unprocessed_paths[:max_num_to_classify]
+    batch = files_to_classify(params.max_num_to_classify)
+    ensure_hashed(batch)
+    finder = DuplicateFinder()
+    candidates = {c.file.path: c for c in pick_candidates(batch, finder, logger)}
+    to_process = list(candidates)
 
     if to_process:
+        unprocessed = IndexedFile.objects.filter(source_image__isnull=True).count()
         logger.info(
-            f"Found {len(unprocessed_paths)} new images. Will classify {len(to_process)} in this run. Specifically: {', '.join(to_process)}"
+            f"Found {unprocessed} new images. Will classify {len(to_process)} in this run "
+            f"with {params.concurrency} parallel requests. Specifically: {', '.join(to_process)}"
         )
-        for image_path in to_process:
-            classify_new_image(image_path, logger, params=params)
+        backoff = _Backoff()
+        # Workers only talk to OpenAI; each result is saved here, on the job's
+        # thread, as soon as it arrives so a crash loses at most the in-flight ones.
+        with ThreadPoolExecutor(max_workers=params.concurrency, thread_name_prefix="classify") as pool:
+            futures = {
+                pool.submit(classify_with_backoff, path, candidates[path].file.sha256, backoff): path
+                for path in to_process
+            }
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    classification = future.result()
+                except Exception as e:
+                    logger.error(f"Classification of image with path \"{path}\" failed. OpenAI error.\n{e!r}")
+                    logger.incr("failed")
+                    continue
+                if classification is None:
+                    continue
+                source_image = save_classification(candidates[path], classification, logger)
+                finder.add(source_image.pk, candidates[path].phash)
+                logger.incr("classified")
     else:
         logger.debug(
             f"No new images to classify"
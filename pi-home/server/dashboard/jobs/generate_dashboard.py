@@ -1,48 +1,135 @@
-from dashboard.jobs.job_registry import register
 from dashboard.constants import (
     IMAGE_DIR,
+    BROWSER_RENDERER,
+    PILLOW_RENDERER,
+    DashboardRenderer,
 )
-from dashboard.color_constants import EXTENDED_PALETTE_SET
+from dashboard.color_constants import EXTENDED
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple, Union, cast
+import io
+from PIL import Image
 from dashboard.jobs.job_registry import register
 from dashboard.models.job import Job
 from dashboard.models.application import PrerenderedDashboard
+from dashboard.models.schedule import Display
 from dashboard.services.logger_job import RunLogger
+from dashboard.services.file_index import sha256_file
 from dashboard.services.generate_art import run_art_generation_pipeline, ImageProcessingContext
 from django.utils import timezone
-from dashboard.services.render_page import render_png
+from dashboard.services.render_page import render_png, DEFAULT_W, DEFAULT_H
+from dashboard.services.render_dashboard import render_dashboard_image
+from dashboard.views.dashboard import DashboardView, DashboardViewData
+
+
+@dataclass(frozen=True)
+class DashboardTarget:
+    """One geometry to render with one renderer, and the palettes to quantize it to."""
+    renderer: DashboardRenderer
+    width: int
+    height: int
+    palettes: Tuple[str, ...]
+
+
+def dashboard_targets() -> List[DashboardTarget]:
+    """
+    Distinct (renderer, geometry) combinations over all displays, each with
+    the palettes in use for it. Without displays, the default 1200x1600 page.
+    """
+    grouped: Dict[Tuple[str, int, int], Set[str]] = {}
+    for renderer, width, height, palette in Display.objects.values_list(
+        "dashboard_renderer", "x_res", "y_res", "palette",
+    ).distinct():
+        grouped.setdefault((renderer, width, height), set()).add(palette)
+    if not grouped:
+        grouped[(BROWSER_RENDERER, DEFAULT_W, DEFAULT_H)] = {EXTENDED}
+    return [
+        DashboardTarget(cast(DashboardRenderer, renderer), width, height, tuple(sorted(palettes)))
+        for (renderer, width, height), palettes in sorted(grouped.items())
+    ]
+
+
+def render_dashboard(
+    renderer: DashboardRenderer,
+    width: int = DEFAULT_W,
+    height: int = DEFAULT_H,
+    view_data: Optional[DashboardViewData] = None,
+) -> Union[bytes, Image.Image]:
+    """The unquantised dashboard: PNG bytes from the browser, or an image drawn with Pillow."""
+    if renderer == PILLOW_RENDERER:
+        if view_data is None:
+            view_data = DashboardView().build_view_data(timezone.now())
+        return render_dashboard_image(view_data, width, height)
+    url = f"http://localhost:8000/dashboard?w={width}&h={height}" # TODO wire in env vars for dynamic port allocation
+    return render_png(url, width=width, height=height)
+
 
 @register("DASHBOARD")
 def generate_dashboard(job: Job, logger: RunLogger, params):
-    now = timezone.now()
+    targets = dashboard_targets()
+    logger.info(f"Generating dashboards for {len(targets)} geometries")
+    # Drawn with Pillow, all geometries show the same data
+    view_data = None
+    if any(t.renderer == PILLOW_RENDERER for t in targets):
+        view_data = DashboardView().build_view_data(timezone.now())
 
-    newDashboard = PrerenderedDashboard.objects.create(
-        path=None, # None means process started byt generation not funished
-    )
+    failed: List[str] = []
+    for target in targets:
+        try:
+            _generate(target, view_data, logger)
+        except Exception:
+            failed.append(f"{target.renderer} {target.width}x{target.height}")
+    if failed:
+        raise RuntimeError(f"Dashboard generation failed for: {', '.join(failed)}")
 
-    logger.info("Generating dashboard")
-    out_path = Path(IMAGE_DIR).resolve() / "dashboards" / f"last_dashboard-{now.strftime('%Y%m%d')}.png"
-    url = "http://localhost:8000/dashboard" # TODO wire in env vars for dynamic port allocation
 
+def _generate(target: DashboardTarget, view_data: Optional[DashboardViewData], logger: RunLogger):
+    geometry = f"{target.width}x{target.height}"
+
+    newDashboards = {
+        palette: PrerenderedDashboard.objects.create(
+            path=None, # None means process started byt generation not funished
+            renderer=target.renderer,
+            width=target.width,
+            height=target.height,
+            palette=palette,
+        )
+        for palette in target.palettes
+    }
+
+    logger.info(f"Generating dashboard ({target.renderer}, {geometry})")
     try:
-        png_bytes = render_png(url)
+        rendered = render_dashboard(target.renderer, target.width, target.height, view_data)
+        if isinstance(rendered, bytes):
+            # Decoded once, quantized once per palette
+            with Image.open(io.BytesIO(rendered)) as img:
+                rendered = img.convert("RGB")
     except Exception as e:
         logger.error(f"Dashboard generation failed\n{str(e)}",)
         raise
-    
-    logger.info("Running post processing")
-    try:
-        ctx: ImageProcessingContext = ImageProcessingContext(
-            logger=logger,
-            pipeline=["quantize_to_palette","output_image"],
-            pipeline_args=[(EXTENDED_PALETTE_SET,), ("png",)],
-        )
-        out_path = run_art_generation_pipeline(png_bytes, context=ctx)
-    except Exception as e:
-        logger.error(f"Pineline after dashboard failed\n{str(e)}")
-        raise
-    
-    newDashboard.path = str(out_path) # Generation successful
-    newDashboard.save()
+    if rendered.size != (target.width, target.height):
+        logger.warn(f"Rendered {rendered.size[0]}x{rendered.size[1]} instead of {geometry}; resizing")
+        rendered = rendered.resize((target.width, target.height), Image.Resampling.LANCZOS)
 
+    for palette, newDashboard in newDashboards.items():
+        logger.info(f"Running post processing ({palette})")
+        out_path = (
+            Path(IMAGE_DIR).resolve() / "dashboards"
+            # One file per row: a later run never rewrites an image a row (and its etag) points to
+            / f"dashboard-{newDashboard.pk}-{target.renderer}-{geometry}-{palette}.png"
+        )
+        try:
+            ctx: ImageProcessingContext = ImageProcessingContext(
+                logger=logger,
+                pipeline=["quantize_to_palette","output_image"],
+                pipeline_args=[(palette,), (out_path, "png")],
+            )
+            out_path = run_art_generation_pipeline(rendered, context=ctx)
+        except Exception as e:
+            logger.error(f"Pineline after dashboard failed\n{str(e)}")
+            raise
 
+        newDashboard.path = str(out_path) # Generation successful
+        newDashboard.etag = sha256_file(out_path)
+        newDashboard.save()
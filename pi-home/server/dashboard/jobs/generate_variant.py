@@ -7,6 +7,7 @@ from dashboard.jobs.job_registry import register
 from dashboard.models.job import Job
 from dashboard.models.photos import SourceImage, Variant
 from dashboard.services.logger_job import RunLogger
+from dashboard.services.file_index import sha256_file
 from pydantic import BaseModel
 from dashboard.services.generate_art import run_art_generation_pipeline, ImageProcessingContext
 from dashboard.services.classify_image import ImageClassification
@@ -46,6 +47,19 @@ def generate_variant(job: Job, logger: RunLogger, params: GenerateVariantParams
     if not src.classification:
         raise RuntimeError("Image has not been calassified yet. Cannot create variant")
     classification = ImageClassification.model_validate(src.classification)
+
+    # Legacy rows from before deduplication can share content once
+    # `manage.py backfill_image_hashes` has hashed them; reuse their output
+    if src.sha256:
+        twin = (
+            Variant.objects
+            .filter(source_image__sha256=src.sha256, path__isnull=False)
+            .exclude(source_image=src)
+            .first()
+        )
+        if twin:
+            logger.info(f"Source image {src.pk} has the same content as source image {twin.source_image_id}, which already has variant {twin.pk}. Skipping generation.")
+            return
     logger.debug(f"Starting generation of variant of source image with id {src.pk}")
 
     input = Path(src.path)
@@ -88,6 +102,7 @@ def generate_variant(job: Job, logger: RunLogger, params: GenerateVariantParams
         )
         logger.info("Image processing pipeline finished for artwork.")
         newVariant.path = str(output)
+        newVariant.etag = sha256_file(output)
         newVariant.art_style = art_style
         newVariant.save()
         logger._close_success("Image processing pipeline finished")
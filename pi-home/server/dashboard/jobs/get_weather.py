@@ -7,6 +7,7 @@ import dashboard.services.get_weather as weather_service
 from dashboard.services.util import convert_unix_dt_to_datetime, local_date
 import datetime
 from dataclasses import dataclass
+from django.db import transaction
 
 @dataclass
 class Context:
@@ -79,7 +80,8 @@ def get_weather(_, logger: RunLogger, params):
         weatherData = weather_service.get_weather((location.latitude, location.longitude))
 
         for record in weatherData.daily:
-            process_record(record, location, context=Context(now=now))
+            with transaction.atomic():  # forecast and its details land together
+                process_record(record, location, context=Context(now=now))
 
 
 
@@ -1,5 +1,5 @@
 from typing import List, Tuple, Final, Dict, Callable, Any, Literal, TypeAlias
-from dashboard.color_constants import SHADED_PALETTE_SET
+from dashboard.color_constants import SHADED
 from dataclasses import dataclass
 
 
@@ -358,72 +358,72 @@ PERSON_ART_STYLES: List[PipelineDeclaration] = [
     (
         COMMUNIST_POSTER,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("communist-poster.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("communist-poster.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         STUDIO_GHIBLI_STYLE,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("studio-ghibli-style.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("studio-ghibli-style.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         PIXAR_STYLE,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("pixar-style.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("pixar-style.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         DISNEY_CLASSIC,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("disney-classic.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("disney-classic.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         SPIDERVERSE_COMIC,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("spiderverse-comic.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("spiderverse-comic.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         RETRO_PIXEL_ART,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("retro-pixel-art.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("retro-pixel-art.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         POINTILLISM_HALFTONE,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("pointillism-halftone.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("pointillism-halftone.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         MARKER_DRAWING,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("marker-drawing.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("marker-drawing.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         CUBISM_ABSTRACT_FACE,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("cubism-abstract-face.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("cubism-abstract-face.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         WARHOL_POP_ART,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("warhol-pop-art.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("warhol-pop-art.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         WOODCUT_LINOCUT,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("woodcut-linocut.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("woodcut-linocut.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         MINIMAL_VECTOR_PORTRAIT,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("minimal-vector-portrait.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("minimal-vector-portrait.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         CHILDRENS_BOOK_ILLUSTRATION,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("childrens-book-illustration.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("childrens-book-illustration.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         MOEBIUS_FRENCH_SCI_FI,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("moebius-french-sci-fi.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("moebius-french-sci-fi.md",), (None,), (SHADED,), ("png",)],
     ),
 ]
 
@@ -432,57 +432,57 @@ PEOPLE_ART_STYLES: List[PipelineDeclaration] = [
     (
         COMIC_BOOK_VIGNETTE,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("comic-book-vignette.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("comic-book-vignette.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         MANGA_DYNAMIC,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("manga-dynamic.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("manga-dynamic.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         GHIBLI_GROUP_SCENE,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("ghibli-group-scene.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("ghibli-group-scene.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         SPIDERVERSE_COMIC,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("spiderverse-comic.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("spiderverse-comic.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         GRITTY_WESTERN_COMICS,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("gritty-western-comics.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("gritty-western-comics.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         STENCIL_BANKSY_STYLE,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("stencil-banksy-style.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("stencil-banksy-style.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         CHILDRENS_BOOK_ILLUSTRATION,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("childrens-book-illustration.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("childrens-book-illustration.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         STUDIO_GHIBLI_STYLE,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("studio-ghibli-style.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("studio-ghibli-style.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         PIXAR_STYLE,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("pixar-style.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("pixar-style.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         DISNEY_CLASSIC,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("disney-classic.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("disney-classic.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         MOEBIUS_FRENCH_SCI_FI,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("moebius-french-sci-fi.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("moebius-french-sci-fi.md",), (None,), (SHADED,), ("png",)],
     ),
 ]
 
@@ -491,62 +491,62 @@ ANIMAL_ART_STYLES: List[PipelineDeclaration] = [
     (
         INK_WATERCOLOR,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("ink-watercolor.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("ink-watercolor.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         RETRO_ZOO_POSTER,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("retro-zoo-poster.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("retro-zoo-poster.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         NATURALIST_SKETCH,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("naturalist-sketch.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("naturalist-sketch.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         CARTOON_MASCOT,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("cartoon-mascot.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("cartoon-mascot.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         PIXEL_SPRITE_ANIMAL,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("pixel-sprite-animal.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("pixel-sprite-animal.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         LOWPOLY_GEOMETRIC,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("lowpoly-geometric.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("lowpoly-geometric.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         PAPERCUT_LAYER_ART,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("papercut-layer-art.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("papercut-layer-art.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         TOTEM_MYTHOLOGICAL,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("totem-mythisch-totem.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("totem-mythisch-totem.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         WOODCUT_ENGRAVING,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("woodcut-engraving.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("woodcut-engraving.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         STUDIO_GHIBLI_STYLE,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("studio-ghibli-style.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("studio-ghibli-style.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         DISNEY_CLASSIC,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("disney-classic.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("disney-classic.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         PIXAR_STYLE,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("pixar-style.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("pixar-style.md",), (None,), (SHADED,), ("png",)],
     ),
 ]
 
@@ -555,47 +555,47 @@ LANDSCAPE_ART_STYLES: List[PipelineDeclaration] = [
     (
         UKIYOE_WOODBLOCK,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("ukiyoe-woodblock.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("ukiyoe-woodblock.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         PENCIL_GRAPHITE,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("pencil-graphite.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("pencil-graphite.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         PASTEL_POSTER,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("pastel-poster.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("pastel-poster.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         SILKSCREEN_PRINT,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("silkscreen-print.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("silkscreen-print.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         GEOMETRIC_ABSTRACTION,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("geometric-abstraction.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("geometric-abstraction.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         ART_DECO_TRAVEL_POSTER,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("art-deco-travel-poster.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("art-deco-travel-poster.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         WATERCOLOR_WASH,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("watercolor-wash.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("watercolor-wash.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         CHARCOAL_DRAWING,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("charcoal-drawing.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("charcoal-drawing.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         MOEBIUS_FRENCH_SCI_FI,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("moebius-french-sci-fi.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("moebius-french-sci-fi.md",), (None,), (SHADED,), ("png",)],
     ),
 ]
 
@@ -604,57 +604,57 @@ NATURE_ART_STYLES: List[PipelineDeclaration] = [
     (
         BOTANICAL_PLATE,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("botanical-plate.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("botanical-plate.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         INK_WASH_PAINTING,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("ink-wash-painting.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("ink-wash-painting.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         STENCIL_LEAVES,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("stencil-leaves.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("stencil-leaves.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         CUTPAPER_COLLAGE,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("cutpaper-collage.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("cutpaper-collage.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         ETCHING_COPPERPLATE,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("etching-copperplate.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("etching-copperplate.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         OUTLINE_WITH_COLOR,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("outline-with-color.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("outline-with-color.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         ART_NOUVEAU_FLORAL,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("art-nouveau-floral.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("art-nouveau-floral.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         UKIYOE_WOODBLOCK,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("ukiyoe-woodblock.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("ukiyoe-woodblock.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         WATERCOLOR_WASH,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("watercolor-wash.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("watercolor-wash.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         POINTILLISM_HALFTONE,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("pointillism-halftone.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("pointillism-halftone.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         SILHOUETTE_COLOR_BLOCKS,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("silhouette-color-blocks.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("silhouette-color-blocks.md",), (None,), (SHADED,), ("png",)],
     ),
 ]
 
@@ -663,72 +663,72 @@ CITY_ART_STYLES: List[PipelineDeclaration] = [
     (
         NOIR_COMIC_SCENE,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("noir-comic-scene.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("noir-comic-scene.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         CYBERPUNK_POSTER,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("cyberpunk-poster.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("cyberpunk-poster.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         SILKSCREEN_SKYLINE,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("silkscreen-skyline.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("silkscreen-skyline.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         ISOMETRIC_PIXEL_CITY,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("isometric-pixel-city.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("isometric-pixel-city.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         CONSTRUCTIVIST_POSTER,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("constructivist-poster.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("constructivist-poster.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         WATERCOLOR_CITYSCAPE,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("watercolor-cityscape.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("watercolor-cityscape.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         VECTOR_FLAT_ILLUSTRATION,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("vector-flat-illustration.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("vector-flat-illustration.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         ART_DECO_ARCHITECTURAL_POSTER,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("art-deco-architectural-poster.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("art-deco-architectural-poster.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         UKIYOE_WOODBLOCK,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("ukiyoe-woodblock.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("ukiyoe-woodblock.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         SPIDERVERSE_COMIC,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("spiderverse-comic.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("spiderverse-comic.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         GRITTY_WESTERN_COMICS,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("gritty-western-comics.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("gritty-western-comics.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         MOEBIUS_FRENCH_SCI_FI,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("moebius-french-sci-fi.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("moebius-french-sci-fi.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         BLUEPRINT_TECHNICAL,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("blueprint-technical.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("blueprint-technical.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         SILHOUETTE_COLOR_BLOCKS,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("silhouette-color-blocks.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("silhouette-color-blocks.md",), (None,), (SHADED,), ("png",)],
     ),
 ]
 
@@ -737,37 +737,37 @@ BUILDING_ART_STYLES: List[PipelineDeclaration] = [
     (
         BLUEPRINT_TECHNICAL,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("blueprint-technical.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("blueprint-technical.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         WOODCUT_ENGRAVING,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("woodcut-engraving.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("woodcut-engraving.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         ART_DECO_ARCHITECTURAL_POSTER,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("art-deco-architectural-poster.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("art-deco-architectural-poster.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         POP_MINIMALISM,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("pop-minimalism.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("pop-minimalism.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         SURREALIST_DECONSTRUCTION,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("surrealist-deconstruction.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("surrealist-deconstruction.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         STAINED_GLASS_STYLE,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("stained-glass-style.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("stained-glass-style.md",), (None,), (SHADED,), ("png",)],
     ),
     (
         LINEART_SKETCH,
         ["openai_process", "resize_crop", "quantize_to_palette", "output_image"],
-        [("lineart-sketch.md",), (None,), (SHADED_PALETTE_SET,), ("png",)],
+        [("lineart-sketch.md",), (None,), (SHADED,), ("png",)],
     ),
 ]
 
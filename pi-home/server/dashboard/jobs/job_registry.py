@@ -10,6 +10,7 @@ from django.db import transaction
 from pydantic import BaseModel
 
 from dashboard.services.logger_job import RunLogger
+from dashboard.services.job_wakeup import notify_job_daemon
 
 Handler = Callable[[Job, RunLogger, Any], str | None]
 
@@ -62,8 +63,47 @@ def test_job(jobKind: JobKind, rethrow: bool = False, *, params: Dict[str,Any]):
             raise
     return logger
 
-@transaction.atomic
+def enqueue_execution(job: Job, params: Dict[str, Any] | None = None) -> Execution:
+    """
+    Queue an execution of an existing job for the daemon and wake it up so it
+    is claimed immediately instead of on the next minute tick.
+    """
+    validator = get_validator(cast(JobKind, job.kind))
+    merged = {**(job.params or {}), **(params or {})}
+    if validator:
+        validator.model_validate(merged)  # fail here, not in the daemon
+    execution = Execution.objects.create(
+        job=job,
+        status=QUEUED,
+        params=merged,
+    )
+    transaction.on_commit(notify_job_daemon)
+    return execution
+
+def enqueue_job(jobKind: JobKind, *, params: Dict[str, Any]) -> Execution:
+    """Like `test_job`, but hands the execution to the daemon instead of running it here."""
+    validator = get_validator(jobKind)
+    if validator:
+        validator.model_validate(params or {})  # before the Job exists, so bad params leave nothing behind
+    job = Job.objects.create(
+        name="Manually triggered",
+        kind=jobKind,
+        job_type=MANUAL,
+        enabled=True,
+        params=params or {},
+    )
+    return enqueue_execution(job)
+
 def run_execution(execution: Execution):
+    """
+    Run a claimed execution in autocommit mode.
+
+    Deliberately not wrapped in a transaction: on SQLite that would hold the
+    write lock for the whole handler runtime and stall log lines, display
+    heartbeats and the web process. Handlers open short `transaction.atomic()`
+    blocks around writes that must land together; status updates are
+    committed by RunLogger on their own.
+    """
     if not execution.status == RUNNING:
         raise RuntimeError(f"Execution with id {execution.pk} does not have status set to running")
     
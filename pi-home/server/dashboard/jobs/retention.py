@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from datetime import timedelta, datetime
+from pathlib import Path
+from typing import List, Optional
+
+from django.db import transaction
+from django.db.models import Exists, Max, OuterRef
+from django.utils import timezone
+from pydantic import BaseModel, PositiveInt
+
+from dashboard.constants import (
+    JOB_KIND_CHOICES,
+    JOB_LOG_RETENTION_DAYS,
+    DEFAULT_JOB_LOG_RETENTION_DAYS,
+    EXECUTION_RETENTION_DAYS,
+    DEFAULT_EXECUTION_RETENTION_DAYS,
+    DASHBOARD_RETENTION_HOURS,
+    LOCAL_TZ,
+    MANUAL,
+    SUCCESS,
+    ERROR,
+    RUNNING,
+    QUEUED,
+)
+from dashboard.jobs.job_registry import register
+from dashboard.models.application import PrerenderedDashboard
+from dashboard.models.job import Job, Execution, JobLogEntry, ExecutionDailyRollup
+from dashboard.services.logger_job import RunLogger
+
+ALL_KINDS = [t[0] for t in JOB_KIND_CHOICES]
+
+
+class RetentionJobParams(BaseModel):
+    # Rows deleted per transaction; keeps every write lock short
+    batch_size: PositiveInt = 500
+    # Upper bound on batches per run so one run never monopolises the DB
+    max_batches: PositiveInt = 200
+
+
+def _percentile(sorted_vals: List[int], pct: float) -> Optional[int]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_vals:
+        return None
+    rank = max(1, -(-len(sorted_vals) * pct // 100))  # ceil
+    return sorted_vals[int(rank) - 1]
+
+
+def _merge_weighted(old: Optional[int], old_n: int, new: Optional[int], new_n: int) -> Optional[int]:
+    if old is None or old_n == 0:
+        return new
+    if new is None or new_n == 0:
+        return old
+    return round((old * old_n + new * new_n) / (old_n + new_n))
+
+
+def prune_logs(now: datetime, params: RetentionJobParams, budget: int) -> tuple[int, int]:
+    """Delete expired JobLogEntry rows per kind. Returns (deleted, batches used)."""
+    deleted = batches = 0
+    for kind in ALL_KINDS:
+        cutoff = now - timedelta(days=JOB_LOG_RETENTION_DAYS.get(kind, DEFAULT_JOB_LOG_RETENTION_DAYS))
+        while batches < budget:
+            ids = list(
+                JobLogEntry.objects
+                .filter(execution__job__kind=kind, ts__lt=cutoff)
+                .values_list("pk", flat=True)[:params.batch_size]
+            )
+            if not ids:
+                break
+            deleted += JobLogEntry.objects.filter(pk__in=ids).delete()[0]
+            batches += 1
+    return deleted, batches
+
+
+def _local_midnight(dt: datetime) -> datetime:
+    return dt.astimezone(LOCAL_TZ).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def rollup_executions(now: datetime, params: RetentionJobParams, budget: int) -> tuple[int, int]:
+    """
+    Roll expired, finished executions into daily aggregates and delete them,
+    one whole local day at a time.
+
+    Percentiles are computed over the full day before anything is deleted.
+    Counts are updated in the same short transaction that deletes each batch,
+    so a crash never double-counts or loses rows; only a day interrupted
+    half-way gets count-weighted percentiles. Returns (deleted, batches used).
+    """
+    deleted = batches = 0
+    for kind in ALL_KINDS:
+        ttl = EXECUTION_RETENTION_DAYS.get(kind, DEFAULT_EXECUTION_RETENTION_DAYS)
+        cutoff = _local_midnight(now - timedelta(days=ttl))  # whole days only
+        expired = (
+            Execution.objects
+            .filter(job__kind=kind, created_at__lt=cutoff)
+            .exclude(status__in=[RUNNING, QUEUED])
+        )
+        while batches < budget:
+            oldest = expired.order_by("created_at").values_list("created_at", flat=True).first()
+            if oldest is None:
+                break
+            day_start = _local_midnight(oldest)
+            day_qs = expired.filter(created_at__gte=day_start, created_at__lt=day_start + timedelta(days=1))
+            runtimes = sorted(day_qs.exclude(runtime_ms=None).values_list("runtime_ms", flat=True))
+            p50, p95 = _percentile(runtimes, 50), _percentile(runtimes, 95)
+            percentiles_pending = True
+
+            while batches < budget:
+                rows = list(day_qs.values("pk", "status")[:params.batch_size])
+                if not rows:
+                    break
+                with transaction.atomic():
+                    rollup, _ = ExecutionDailyRollup.objects.get_or_create(kind=kind, day=day_start.date())
+                    if percentiles_pending:
+                        rollup.p50_runtime_ms = _merge_weighted(rollup.p50_runtime_ms, rollup.count, p50, len(runtimes))
+                        rollup.p95_runtime_ms = _merge_weighted(rollup.p95_runtime_ms, rollup.count, p95, len(runtimes))
+                        percentiles_pending = False
+                    rollup.count += len(rows)
+                    rollup.success_count += sum(1 for r in rows if r["status"] == SUCCESS)
+                    rollup.error_count += sum(1 for r in rows if r["status"] == ERROR)
+                    rollup.save()
+                    Execution.objects.filter(pk__in=[r["pk"] for r in rows]).delete()  # cascades remaining logs
+                deleted += len(rows)
+                batches += 1
+    return deleted, batches
+
+
+def prune_manual_jobs(now: datetime, params: RetentionJobParams) -> int:
+    """Every manual trigger creates a Job; drop the ones whose executions are all gone."""
+    cutoff = now - timedelta(days=DEFAULT_EXECUTION_RETENTION_DAYS)
+    ids = list(
+        Job.objects
+        .filter(job_type=MANUAL, created_at__lt=cutoff)
+        .annotate(has_executions=Exists(Execution.objects.filter(job=OuterRef("pk"))))
+        .filter(has_executions=False)
+        .values_list("pk", flat=True)[:params.batch_size]
+    )
+    return Job.objects.filter(pk__in=ids).delete()[0] if ids else 0
+
+
+def prune_dashboards(now: datetime, params: RetentionJobParams) -> int:
+    """
+    Delete old rendered dashboards and their files. The newest rendered one of
+    every renderer, geometry and palette stays, however old, so displays always
+    have something to show; rows of runs that never finished go too.
+    """
+    cutoff = now - timedelta(hours=DASHBOARD_RETENTION_HOURS)
+    newest = (
+        PrerenderedDashboard.objects.exclude(path=None)
+        .values("renderer", "width", "height", "palette")
+        .annotate(newest_pk=Max("pk"))
+        .values_list("newest_pk", flat=True)
+    )
+    keep = set(newest)
+    expired = [
+        row for row in PrerenderedDashboard.objects.filter(created_at__lt=cutoff)
+        .values("pk", "path")[:params.batch_size]
+        if row["pk"] not in keep
+    ]
+    if not expired:
+        return 0
+    # Rows from before one-file-per-row naming can share a file with a kept row
+    kept_paths = set(PrerenderedDashboard.objects.filter(pk__in=keep).values_list("path", flat=True))
+    PrerenderedDashboard.objects.filter(pk__in=[row["pk"] for row in expired]).delete()
+    for row in expired:
+        if row["path"] and row["path"] not in kept_paths:
+            Path(row["path"]).unlink(missing_ok=True)
+    return len(expired)
+
+
+@register("RETENTION", RetentionJobParams)
+def retention(_, logger: RunLogger, params: RetentionJobParams):
+    now = timezone.now()
+    logs_deleted, used = prune_logs(now, params, params.max_batches)
+    logger.info(f"Deleted {logs_deleted} expired log lines in {used} batches")
+
+    execs_deleted, used_execs = rollup_executions(now, params, params.max_batches - used)
+    logger.info(f"Rolled up and deleted {execs_deleted} expired executions in {used_execs} batches")
+
+    jobs_deleted = prune_manual_jobs(now, params)
+    if jobs_deleted:
+        logger.info(f"Deleted {jobs_deleted} manual jobs without executions")
+
+    dashboards_deleted = prune_dashboards(now, params)
+    if dashboards_deleted:
+        logger.info(f"Deleted {dashboards_deleted} old rendered dashboards")
+
+    if used + used_execs >= params.max_batches:
+        logger.warn("Batch budget exhausted; remaining rows are pruned on the next run")
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.models.photos import SourceImage
+from dashboard.services.file_index import BATCH_SIZE, sha256_file
+from dashboard.services.image_processing import perceptual_hash
+
+
+class Command(BaseCommand):
+    help = (
+        "Hash source images classified before content hashing existed, so duplicate "
+        "detection and variant reuse also cover them. Safe to run more than once."
+    )
+
+    def handle(self, *args, **options):
+        pending = SourceImage.objects.filter(sha256=None).only("pk", "path", "sha256", "phash")
+        hashed: list[SourceImage] = []
+        missing = 0
+        for src in pending.iterator(chunk_size=BATCH_SIZE):
+            try:
+                src.sha256 = sha256_file(src.path)
+            except FileNotFoundError:
+                missing += 1
+                continue
+            if src.phash is None:
+                try:
+                    src.phash = perceptual_hash(src.path)
+                except Exception:
+                    pass  # Unreadable image; exact-content matching still works
+            hashed.append(src)
+        SourceImage.objects.bulk_update(hashed, ["sha256", "phash"], batch_size=BATCH_SIZE)
+        self.stdout.write(f"Hashed {len(hashed)} source images; {missing} files are missing.")
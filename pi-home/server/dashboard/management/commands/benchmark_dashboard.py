@@ -0,0 +1,125 @@
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List
+
+import psutil
+from django.core.management.base import BaseCommand
+
+from dashboard.color_constants import EXTENDED
+from dashboard.constants import DASHBOARD_RENDERER_CHOICES, DashboardRenderer
+from dashboard.jobs.generate_dashboard import render_dashboard
+from dashboard.services.generate_art import ConsoleLogger, ImageProcessingContext, run_art_generation_pipeline
+from dashboard.services.render_page import get_renderer
+
+VALID_RENDERERS = [r[0] for r in DASHBOARD_RENDERER_CHOICES]
+SAMPLE_INTERVAL_SECS = 0.02
+
+
+def _tree_rss() -> int:
+    """Resident memory of this process and its children (the browser, when it runs)."""
+    proc = psutil.Process()
+    total = proc.memory_info().rss
+    for child in proc.children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            continue
+    return total
+
+
+class _PeakRss:
+    def __init__(self):
+        self.peak = 0
+
+
+@contextmanager
+def _sample_peak_rss() -> Iterator[_PeakRss]:
+    result = _PeakRss()
+    stop = threading.Event()
+
+    def sample():
+        while not stop.is_set():
+            result.peak = max(result.peak, _tree_rss())
+            stop.wait(SAMPLE_INTERVAL_SECS)
+
+    thread = threading.Thread(target=sample, daemon=True)
+    thread.start()
+    try:
+        yield result
+    finally:
+        stop.set()
+        thread.join()
+        result.peak = max(result.peak, _tree_rss())
+
+
+def _mib(n: float) -> str:
+    return f"{n / (1024 * 1024):.0f} MiB"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare dashboard renderers: latency of rendering and of the e-ink post processing, "
+        "and peak memory of this process plus its children. The browser renderer screenshots "
+        "http://localhost:8000/dashboard, so the web server must be running."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5, help="Warm runs per renderer (after one cold run).")
+        parser.add_argument(
+            "--renderer",
+            action="append",
+            choices=VALID_RENDERERS,
+            default=None,
+            help="Renderer to benchmark (repeatable). Default: all.",
+        )
+
+    def handle(self, *args, **options):
+        runs: int = max(1, options["runs"])
+        renderers: List[DashboardRenderer] = options["renderer"] or VALID_RENDERERS
+        for renderer in renderers:
+            try:
+                self._benchmark(renderer, runs)
+            except Exception as e:
+                self.stderr.write(self.style.ERROR(f"{renderer}: failed: {e}"))
+        get_renderer().shutdown()
+
+    def _benchmark(self, renderer: DashboardRenderer, runs: int):
+        def render():
+            return render_dashboard(renderer)
+
+        def post_process(rendered):
+            ctx = ImageProcessingContext(
+                logger=ConsoleLogger(),
+                pipeline=["quantize_to_palette", "output_bytes"],
+                pipeline_args=[(EXTENDED,), ("png",)],
+            )
+            return run_art_generation_pipeline(rendered, context=ctx)
+
+        baseline = _tree_rss()
+        render_times: List[float] = []
+        post_times: List[float] = []
+        with _sample_peak_rss() as peak:
+            for i in range(runs + 1):
+                rendered, render_s = self._timed(render)
+                _, post_s = self._timed(lambda: post_process(rendered))
+                if i == 0:
+                    self.stdout.write(f"{renderer}: cold run {render_s * 1000:.0f} ms render, {post_s * 1000:.0f} ms post")
+                    continue
+                render_times.append(render_s)
+                post_times.append(post_s)
+
+        self.stdout.write(
+            f"{renderer}: {runs} warm runs; "
+            f"render median {statistics.median(render_times) * 1000:.0f} ms "
+            f"(min {min(render_times) * 1000:.0f}, max {max(render_times) * 1000:.0f}); "
+            f"post median {statistics.median(post_times) * 1000:.0f} ms; "
+            f"peak RSS {_mib(peak.peak)} ({_mib(peak.peak - baseline)} above baseline)"
+        )
+
+    @staticmethod
+    def _timed(fn: Callable):
+        start = time.perf_counter()
+        result = fn()
+        return result, time.perf_counter() - start
@@ -1,6 +1,6 @@
 from django.core.management.base import BaseCommand, CommandError
 from dashboard.constants import JOB_KIND_CHOICES, JobKind, RUNNING
-from dashboard.jobs.job_registry import test_job
+from dashboard.jobs.job_registry import test_job, enqueue_job
 
 import dashboard.jobs.classify
 import dashboard.jobs.dummy_job
@@ -8,6 +8,7 @@ import dashboard.jobs.generate_variant
 import dashboard.jobs.get_weather
 import dashboard.jobs.calendar
 import dashboard.jobs.generate_dashboard
+import dashboard.jobs.retention
 
 from typing import cast, Dict, Any
 import json
@@ -30,6 +31,12 @@ class Command(BaseCommand):
             help="Job parameter (repeatable). Example: --param source_image_id=1",
         )
 
+        parser.add_argument(
+            "--enqueue",
+            action="store_true",
+            help="Queue the job for the running daemon instead of running it in this process.",
+        )
+
         # OR provide a JSON dict in one go
         parser.add_argument(
             "--params-json",
@@ -54,4 +61,9 @@ class Command(BaseCommand):
             key, value = item.split("=", 1)
             params[key] = value
 
+        if options["enqueue"]:
+            execution = enqueue_job(cast(JobKind, job_kind), params=params)
+            self.stdout.write(self.style.SUCCESS(f"Queued execution {execution.pk} for {job_kind}"))
+            return
+
         test_job(cast(JobKind, job_kind), params=params)
@@ -6,7 +6,7 @@ from django.db import transaction
 from dashboard.models.job import Job 
 from dashboard.models.weather import Location
 from dashboard.models.calendar import CalendarSource
-from dashboard.constants import CRON, CLASSIFY, ART, DUMMY, WEATHER
+from dashboard.constants import CRON, CLASSIFY, ART, DUMMY, WEATHER, RETENTION
 from dashboard.constants import LOCAL_TZ, ICAL_GOOGLE_CALENDAR_URL
 
 
@@ -26,7 +26,7 @@ class Command(BaseCommand):
                 "job_type": CRON,
                 "cron": "*/5 * * * *",  # every 5 minutes
                 "enabled": True,
-                "params": {},           # add API keys or tuning knobs later if needed
+                "params": {"max_num_to_classify": 50, "concurrency": 4},
             },
             {
                 "name": "generate-art-variants",
@@ -44,6 +44,14 @@ class Command(BaseCommand):
                 "enabled": True,
                 "params": {},
             },
+            {
+                "name": "prune-job-history",
+                "kind": RETENTION,
+                "job_type": CRON,
+                "cron": "30 3 * * *",    # every night at 03:30, outside the busy hours
+                "enabled": True,
+                "params": {},
+            },
             {
                 "name": "dummy-heartbeat",
                 "kind": DUMMY,
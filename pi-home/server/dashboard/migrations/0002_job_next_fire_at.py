@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:30
+
+from datetime import datetime
+
+from croniter import croniter
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def populate_next_fire_at(apps, schema_editor):
+    Job = apps.get_model("dashboard", "Job")
+    now = timezone.now()
+    for job in Job.objects.filter(job_type="CRON", enabled=True, cron__isnull=False):
+        job.next_fire_at = croniter(job.cron, now).get_next(datetime)
+        job.save(update_fields=["next_fire_at"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='next_fire_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.RunPython(populate_next_fire_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0002_job_next_fire_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='kind',
+            field=models.CharField(choices=[('CALENDAR', 'Get calendar'), ('RSS', 'Get RSS'), ('WEATHER', 'Get weather'), ('PUSH', 'Push to displays'), ('ART', 'Generate art'), ('NEWSPAPER', 'Generate newspaper'), ('CLASSIFY', 'Classify image'), ('MANUAL_TRIGGER', 'Manually triggered'), ('DASHBOARD', 'Generate dashboard'), ('DUMMY', 'Dummy job to test the scheduler and the commands'), ('RETENTION', 'Prune and roll up old executions and logs')], max_length=64),
+        ),
+        migrations.CreateModel(
+            name='ExecutionDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('CALENDAR', 'Get calendar'), ('RSS', 'Get RSS'), ('WEATHER', 'Get weather'), ('PUSH', 'Push to displays'), ('ART', 'Generate art'), ('NEWSPAPER', 'Generate newspaper'), ('CLASSIFY', 'Classify image'), ('MANUAL_TRIGGER', 'Manually triggered'), ('DASHBOARD', 'Generate dashboard'), ('DUMMY', 'Dummy job to test the scheduler and the commands'), ('RETENTION', 'Prune and roll up old executions and logs')], max_length=64)),
+                ('day', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('success_count', models.PositiveIntegerField(default=0)),
+                ('error_count', models.PositiveIntegerField(default=0)),
+                ('p50_runtime_ms', models.PositiveIntegerField(default=None, null=True)),
+                ('p95_runtime_ms', models.PositiveIntegerField(default=None, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-day', 'kind'],
+                'unique_together': {('kind', 'day')},
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0004_file_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sourceimage',
+            name='phash',
+            field=models.CharField(default=None, max_length=16, null=True),
+        ),
+        migrations.AddField(
+            model_name='sourceimage',
+            name='sha256',
+            field=models.CharField(db_index=True, default=None, max_length=64, null=True),
+        ),
+    ]
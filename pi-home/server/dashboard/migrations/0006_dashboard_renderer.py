@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0005_source_image_hashes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='display',
+            name='dashboard_renderer',
+            field=models.CharField(choices=[('browser', 'Headless browser (HTML page)'), ('pillow', 'Pillow (drawn directly)')], default='browser', help_text="How this display's dashboard is drawn", max_length=16),
+        ),
+        migrations.AddField(
+            model_name='prerendereddashboard',
+            name='renderer',
+            field=models.CharField(choices=[('browser', 'Headless browser (HTML page)'), ('pillow', 'Pillow (drawn directly)')], default='browser', max_length=16),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0006_dashboard_renderer'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='display',
+            name='palette',
+            field=models.CharField(choices=[('native', 'Native'), ('extended', 'Extended'), ('shaded', 'Shaded'), ('native_with_skin', 'Native with skin tones')], default='extended', help_text='Colours the display can show; dashboards are quantized to these', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='prerendereddashboard',
+            name='height',
+            field=models.PositiveIntegerField(default=1600),
+        ),
+        migrations.AddField(
+            model_name='prerendereddashboard',
+            name='palette',
+            field=models.CharField(choices=[('native', 'Native'), ('extended', 'Extended'), ('shaded', 'Shaded'), ('native_with_skin', 'Native with skin tones')], default='extended', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='prerendereddashboard',
+            name='width',
+            field=models.PositiveIntegerField(default=1200),
+        ),
+        migrations.AddIndex(
+            model_name='prerendereddashboard',
+            index=models.Index(fields=['width', 'height', 'palette', 'renderer', 'created_at'], name='dashboard_p_width_91e3c0_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0007_dashboard_geometry_palette'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='prerendereddashboard',
+            name='etag',
+            field=models.CharField(default=None, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='variant',
+            name='etag',
+            field=models.CharField(default=None, max_length=64, null=True),
+        ),
+    ]
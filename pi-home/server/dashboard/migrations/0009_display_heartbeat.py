@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0008_image_etags'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='display',
+            name='last_ip',
+            field=models.GenericIPAddressField(blank=True, default=None, null=True),
+        ),
+        migrations.AddField(
+            model_name='display',
+            name='last_user_agent',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
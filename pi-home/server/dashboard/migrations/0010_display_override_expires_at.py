@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0009_display_heartbeat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='display',
+            name='override_expires_at',
+            field=models.DateTimeField(blank=True, default=None, null=True),
+        ),
+    ]
@@ -1,5 +1,5 @@
 from .application import MinuteSystemSample
-from .job import Job, Execution, JobLogEntry
-from .photos import SourceImage, Variant
+from .job import Job, Execution, JobLogEntry, ExecutionDailyRollup
+from .photos import SourceImage, Variant, IndexedDirectory, IndexedFile
 from .schedule import Display
 from .weather import Location, WeatherDetail, DayForecast
@@ -1,4 +1,6 @@
 from django.db import models
+from dashboard.color_constants import EXTENDED, PALETTE_CHOICES
+from dashboard.constants import BROWSER_RENDERER, DASHBOARD_RENDERER_CHOICES
 from dashboard.jobs.image_processing_declaration import (
     ART_STYLE_CHOICES, 
     QUALITY_CLASSIFICATION_CHOICES,
@@ -23,7 +25,18 @@ class MinuteSystemSample(models.Model):
 
 class PrerenderedDashboard(models.Model):
     path = models.TextField(null=True, default=None) # Null means dashboard was created but generation has crashed
+    etag = models.CharField(max_length=64, null=True, default=None) # sha256 of the file at `path`; served as ETag
+    renderer = models.CharField(max_length=16, choices=DASHBOARD_RENDERER_CHOICES, default=BROWSER_RENDERER)
+    # Geometry and palette the image was made for; displays get the one matching theirs
+    width = models.PositiveIntegerField(default=1200)
+    height = models.PositiveIntegerField(default=1600)
+    palette = models.CharField(max_length=32, choices=PALETTE_CHOICES, default=EXTENDED)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["width", "height", "palette", "renderer", "created_at"]),
+        ]
+
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+from datetime import datetime
+from typing import Optional
+
+from croniter import croniter
 from django.db import models
 from django.utils import timezone
 from dashboard.constants import (
@@ -7,10 +11,14 @@ from dashboard.constants import (
     JOB_KIND_CHOICES,
     JOB_STATUS_CHOICES,
     JOB_TYPE_CHOICES,
+    CRON,
     QUEUED,
     RUNNING,
 )
 
+# The fields next_fire_at is derived from
+SCHEDULE_FIELDS = {"cron", "enabled", "job_type"}
+
 
 class Job(models.Model):
     name = models.CharField(max_length=120)
@@ -34,12 +42,46 @@ class Job(models.Model):
     )
     last_run_message = models.TextField(blank=True, default="")
 
+    # Precomputed next cron fire time; the scheduler only asks for rows <= now.
+    # NULL for manual or disabled jobs.
+    next_fire_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self) -> str:
         return f"Job({self.pk}): {self.name} [{self.kind}]"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Reading a deferred field would refresh_from_db, which lands back here
+        if not SCHEDULE_FIELDS & instance.get_deferred_fields():
+            instance._loaded_schedule = instance._schedule_key()
+        return instance
+
+    def _schedule_key(self) -> tuple:
+        return (self.cron, self.enabled, self.job_type)
+
+    def compute_next_fire_at(self, after: Optional[datetime] = None) -> Optional[datetime]:
+        """First cron fire strictly after `after` (default: now), or None if not scheduled."""
+        if self.job_type != CRON or not self.enabled or not self.cron:
+            return None
+        return croniter(self.cron, after or timezone.now()).get_next(datetime)
+
+    def save(self, *args, **kwargs):
+        # Recompute the index only when the schedule itself changed, so saves
+        # from job runs don't push back a fire time the scheduler relies on.
+        # No snapshot (new row, or loaded with the schedule deferred): recompute
+        loaded = getattr(self, "_loaded_schedule", None)
+        if loaded is None or loaded != self._schedule_key() or (self.next_fire_at is None and self.job_type == CRON):
+            self.next_fire_at = self.compute_next_fire_at()
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "next_fire_at"}
+        super().save(*args, **kwargs)
+        self._loaded_schedule = self._schedule_key()
+
 
 class Execution(models.Model):
     job = models.ForeignKey("Job", on_delete=models.CASCADE, related_name="executions")
@@ -91,3 +133,32 @@ class JobLogEntry(models.Model):
             f"JobLogEntry({self.pk}): exec:{self.execution} #{self.seq} [{self.level}]"
         )
 
+
+
+class ExecutionDailyRollup(models.Model):
+    """
+    Aggregate of pruned executions: one row per job kind per local day.
+    Written by the RETENTION job right before it deletes the executions.
+    """
+    kind = models.CharField(max_length=64, choices=JOB_KIND_CHOICES)
+    day = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+    success_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    # Exact when a day fits in one retention batch, count-weighted otherwise
+    p50_runtime_ms = models.PositiveIntegerField(null=True, default=None)
+    p95_runtime_ms = models.PositiveIntegerField(null=True, default=None)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [("kind", "day")]
+        ordering = ["-day", "kind"]
+
+    @property
+    def success_rate(self) -> Optional[float]:
+        return (self.success_count / self.count) if self.count else None
+
+    def __str__(self) -> str:
+        return f"ExecutionDailyRollup({self.kind} @ {self.day}): {self.count} runs"
@@ -8,6 +8,8 @@ from dashboard.jobs.image_processing_declaration import (
 
 class SourceImage(models.Model):
     path = models.TextField()
+    sha256 = models.CharField(max_length=64, null=True, default=None, db_index=True) # Null for images classified before hashing existed; see backfill_image_hashes
+    phash = models.CharField(max_length=16, null=True, default=None) # dHash, see services.image_processing.perceptual_hash
     classification = models.JSONField(null=True, default=None)  # null => not classified yet
     has_variants = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -25,6 +27,7 @@ class Variant(models.Model):
         related_name="rendered_assets",
     )
     path = models.TextField(null=True, default=None) # Null means variant was created but generation has crashed
+    etag = models.CharField(max_length=64, null=True, default=None) # sha256 of the file at `path`; served as ETag
     art_style = models.CharField(max_length=64, choices=ART_STYLE_CHOICES, null=True, default=None)
     
     source_quality = models.CharField(choices=QUALITY_CLASSIFICATION_CHOICES)
@@ -41,3 +44,34 @@ class Variant(models.Model):
     def __str__(self) -> str:
         return f"Variant({self.pk}): {self.path} (artstyle:{self.art_style})"
 
+
+class IndexedDirectory(models.Model):
+    """A directory under IMAGE_DIR as last seen by the file index scanner."""
+    path = models.TextField(unique=True)
+    mtime_ns = models.BigIntegerField()  # Changes when entries are added, removed or renamed
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"IndexedDirectory({self.pk}): {self.path}"
+
+class IndexedFile(models.Model):
+    """An image file under IMAGE_DIR. Kept in sync by services.file_index."""
+    path = models.TextField(unique=True)
+    directory = models.ForeignKey(IndexedDirectory, on_delete=models.CASCADE, related_name="files")
+    size = models.BigIntegerField()
+    mtime_ns = models.BigIntegerField()
+    inode = models.BigIntegerField(db_index=True)
+    sha256 = models.CharField(max_length=64, null=True, default=None, db_index=True) # Null means not hashed yet
+    source_image = models.ForeignKey(
+        SourceImage,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="files",
+    ) # Null means not classified yet
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"IndexedFile({self.pk}): {self.path}"
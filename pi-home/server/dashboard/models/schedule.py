@@ -1,15 +1,29 @@
 # app/models/schedule.py
 from __future__ import annotations
 
+import threading
+import time as monotonic_time
+from bisect import bisect_right
 from dataclasses import dataclass
 from datetime import datetime, time, timedelta
-from typing import Optional, cast
+from typing import Callable, Dict, Optional, Tuple, cast
 
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
 from zoneinfo import ZoneInfo
-from dashboard.constants import MODE_CHOICES, NEWS_MODE, PHOTO_MODE, WEEKDAY_CHOICES, ModeKind
+from dashboard.color_constants import EXTENDED, PALETTE_CHOICES
+from dashboard.constants import (
+    BROWSER_RENDERER,
+    DASHBOARD_RENDERER_CHOICES,
+    MODE_CHOICES,
+    NEWS_MODE,
+    PHOTO_MODE,
+    WEEKDAY_CHOICES,
+    ModeKind,
+)
 from django.contrib.auth.models import User
 
 MIDNIGHT = time(0,0,0)
@@ -23,12 +37,112 @@ def _end_minutes(end_t: time) -> int:
     mins = _minutes_since_midnight(end_t)
     return 24 * 60 if mins == 0 else mins
 
-@dataclass
+# Signals only reach the process that saved the rule (the admin runs in one
+# gunicorn worker, the daemon is another process); other processes rebuild
+# their compiled schedules after this long.
+SCHEDULE_CACHE_TTL_SECS = 60.0
+
+@dataclass(frozen=True)
 class _Window:
     start_min: int
     end_min: int
     mode: ModeKind
 
+
+@dataclass(frozen=True)
+class CompiledSchedule:
+    """
+    A display's active weekly rules as sorted, non-overlapping windows per
+    weekday. Lookups bisect the window starts and never touch the database.
+    """
+    windows: Tuple[Tuple[_Window, ...], ...]  # 7 weekdays, sorted by start
+    starts: Tuple[Tuple[int, ...], ...]  # window start minutes, per weekday
+    boundaries: Tuple[Tuple[int, ...], ...]  # window start and end minutes, per weekday
+
+    @classmethod
+    def from_windows(cls, by_day: list[list[_Window]]) -> "CompiledSchedule":
+        windows = tuple(tuple(sorted(day, key=lambda w: w.start_min)) for day in by_day)
+        marks: list[set[int]] = [set() for _ in range(7)]
+        for weekday, day in enumerate(windows):
+            for w in day:
+                marks[weekday].add(w.start_min)
+                if w.end_min < 24 * 60:
+                    marks[weekday].add(w.end_min)
+                else:
+                    # Ends at midnight: the change happens at 00:00 the next day
+                    marks[(weekday + 1) % 7].add(0)
+        return cls(
+            windows,
+            tuple(tuple(w.start_min for w in day) for day in windows),
+            tuple(tuple(sorted(day)) for day in marks),
+        )
+
+    def mode_at(self, weekday: int, minute: int) -> Optional[ModeKind]:
+        i = bisect_right(self.starts[weekday], minute) - 1
+        if i >= 0:
+            w = self.windows[weekday][i]
+            if minute < w.end_min:
+                return w.mode
+        return None
+
+    def next_start(self, weekday: int, minute: int) -> Optional[Tuple[int, int]]:
+        """(days ahead, start minute) of the first window starting after `minute`."""
+        return self._next_mark(self.starts, weekday, minute)
+
+    def next_change(self, weekday: int, minute: int) -> Optional[Tuple[int, int]]:
+        """(days ahead, minute) of the first window start or end after `minute`."""
+        return self._next_mark(self.boundaries, weekday, minute)
+
+    @staticmethod
+    def _next_mark(marks: Tuple[Tuple[int, ...], ...], weekday: int, minute: int) -> Optional[Tuple[int, int]]:
+        i = bisect_right(marks[weekday], minute)
+        if i < len(marks[weekday]):
+            return 0, marks[weekday][i]
+        for step in range(1, 8):
+            day = marks[(weekday + step) % 7]
+            if day:
+                return step, day[0]
+        return None
+
+
+class _ScheduleCache:
+    def __init__(self, ttl_secs: float = SCHEDULE_CACHE_TTL_SECS):
+        self.ttl_secs = ttl_secs
+        self._lock = threading.Lock()
+        self._compiled: Dict[int, Tuple[CompiledSchedule, float]] = {}
+
+    def get(self, display_id: int) -> CompiledSchedule:
+        now = monotonic_time.monotonic()
+        with self._lock:
+            found = self._compiled.get(display_id)
+        if found is not None and now - found[1] < self.ttl_secs:
+            return found[0]
+        compiled = self._compile(display_id)
+        with self._lock:
+            self._compiled[display_id] = (compiled, now)
+        return compiled
+
+    def invalidate(self, display_id: int) -> None:
+        with self._lock:
+            self._compiled.pop(display_id, None)
+
+    @staticmethod
+    def _compile(display_id: int) -> CompiledSchedule:
+        by_day: list[list[_Window]] = [[] for _ in range(7)]
+        rules = WeeklyRule.objects.filter(display_id=display_id, active=True).values_list(
+            "weekday", "start_time", "end_time", "mode",
+        )
+        for weekday, start, end, mode in rules:
+            by_day[weekday].append(_Window(
+                start_min=_minutes_since_midnight(start),
+                end_min=_end_minutes(end),
+                mode=cast(ModeKind, mode),
+            ))
+        return CompiledSchedule.from_windows(by_day)
+
+
+_schedules = _ScheduleCache()
+
 class Display(models.Model):
     """
     A physical e-ink frame (or logical display).
@@ -44,9 +158,25 @@ class Display(models.Model):
     timezone = models.CharField(max_length=64, default="Europe/Brussels")
     default_mode = models.CharField(max_length=16, choices=MODE_CHOICES, default=PHOTO_MODE)
     override_mode = models.CharField(max_length=16, choices=MODE_CHOICES, null=True, default=None)
+    override_expires_at = models.DateTimeField(null=True, blank=True, default=None)
     last_seen = models.DateTimeField(null=True) # NULL means display has never connected
+    # Written in batches by services.heartbeat, so up to a minute or so behind
+    last_ip = models.GenericIPAddressField(null=True, blank=True, default=None)
+    last_user_agent = models.CharField(max_length=255, blank=True, default="")
     x_res = models.PositiveIntegerField()
     y_res = models.PositiveIntegerField()
+    dashboard_renderer = models.CharField(
+        max_length=16,
+        choices=DASHBOARD_RENDERER_CHOICES,
+        default=BROWSER_RENDERER,
+        help_text="How this display's dashboard is drawn",
+    )
+    palette = models.CharField(
+        max_length=32,
+        choices=PALETTE_CHOICES,
+        default=EXTENDED,
+        help_text="Colours the display can show; dashboards are quantized to these",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -110,36 +240,31 @@ class WeeklyRule(models.Model):
                     f"{other.end_time.strftime('%H:%M') if other.end_time != time(0,0) else '24:00'}"
                 )
 
+    @staticmethod
+    def compiled_schedule(display: Display) -> CompiledSchedule:
+        """The display's rules, compiled once and cached in this process."""
+        return _schedules.get(display.pk)
+
     @staticmethod
     def _windows_for_day(display: Display, weekday: int) -> list[_Window]:
-        rules = (WeeklyRule.objects
-                 .filter(display=display, weekday=weekday, active=True)
-                 .order_by("start_time"))
-        windows: list[_Window] = []
-        for r in rules:
-            s = _minutes_since_midnight(r.start_time)
-            e = _end_minutes(r.end_time)
-            windows.append(_Window(start_min=s, end_min=e, mode=cast(ModeKind,r.mode)))
-        return windows
+        return list(WeeklyRule.compiled_schedule(display).windows[weekday])
 
     @staticmethod
     def resolve_mode(display: Display, now: Optional[datetime] = None) -> ModeKind:
-        display.clear_expired_override()
+        now = timezone.now() if now is None else now
+        if timezone.is_naive(now):
+            now = timezone.make_aware(now, display.tz)
+        display.clear_expired_override(now)
 
-        local_now = timezone.localtime() if now is None else timezone.make_aware(now)
         # In case of override
         if display.override_mode and display.override_expires_at:
-
             if now < display.override_expires_at:
                 return cast(ModeKind,display.override_mode)
-        # Normal case: schedule
-        weekday = local_now.weekday()
-        minutes = local_now.hour * 60 + local_now.minute
-
-        windows = WeeklyRule._windows_for_day(display, weekday)
-        for w in windows:
-            if w.start_min <= minutes < w.end_min:
-                return w.mode
+        # Normal case: schedule, in the display's own timezone
+        local_now = now.astimezone(display.tz)
+        mode = WeeklyRule.compiled_schedule(display).mode_at(local_now.weekday(), local_now.hour * 60 + local_now.minute)
+        if mode is not None:
+            return mode
 
         # If nothing matched (e.g., schedule gaps or no schedule), fall back to default
         return cast(ModeKind,display.default_mode)
@@ -150,6 +275,22 @@ class WeeklyRule(models.Model):
         Find the next *local* datetime when the schedule changes (next window start).
         Used to set override expiry conveniently.
         """
+        return WeeklyRule._next_mark_for_display(display, now_local, CompiledSchedule.next_start)
+
+    @staticmethod
+    def next_change_for_display(display: Display, now_local: Optional[datetime] = None) -> Optional[datetime]:
+        """
+        Next *local* datetime at which a window starts or ends, i.e. when the
+        scheduled mode may change (ending windows fall back to the default mode).
+        """
+        return WeeklyRule._next_mark_for_display(display, now_local, CompiledSchedule.next_change)
+
+    @staticmethod
+    def _next_mark_for_display(
+        display: Display,
+        now_local: Optional[datetime],
+        lookup: Callable[[CompiledSchedule, int, int], Optional[Tuple[int, int]]],
+    ) -> Optional[datetime]:
         if now_local is None:
             now_local = timezone.now().astimezone(display.tz)
 
@@ -161,15 +302,19 @@ class WeeklyRule(models.Model):
             hh, mm = divmod(minute_mark, 60)
             return datetime(target_date.year, target_date.month, target_date.day, hh, mm, tzinfo=display.tz)
 
-        todays = WeeklyRule._windows_for_day(display, weekday)
-        for w in todays:
-            if w.start_min > minutes:
-                return as_dt(0, w.start_min)
+        found = lookup(WeeklyRule.compiled_schedule(display), weekday, minutes)
+        if found is None:
+            return None  # no rules at all
+        return as_dt(*found)
+
+
+@receiver(post_save, sender=WeeklyRule)
+@receiver(post_delete, sender=WeeklyRule)
+def _invalidate_rule_schedule(sender, instance: WeeklyRule, **kwargs):
+    _schedules.invalidate(instance.display_id)
 
-        for step in range(1, 8):
-            wd = (weekday + step) % 7
-            wins = WeeklyRule._windows_for_day(display, wd)
-            if wins:
-                return as_dt(step, wins[0].start_min)
 
-        return None  # no rules at all
+@receiver(post_save, sender=Display)
+@receiver(post_delete, sender=Display)
+def _invalidate_display_schedule(sender, instance: Display, **kwargs):
+    _schedules.invalidate(instance.pk)
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from dataclasses import asdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, cast
+
+from django.contrib.staticfiles import finders
+from django.template.loader import get_template
+
+from dashboard.constants import BOOTSCREEN_CACHE_BYTES, CACHE_DIR
+from dashboard.models.schedule import Display
+from dashboard.services.disk_cache import DiskCache
+from dashboard.services.render_page import render_png, run_eink_pipeline_for_page_in_memory
+from dashboard.views.info_screens import BootScreenData, get_bootscreen_data
+
+# Bump when the render pipeline changes in a way the inputs below do not capture
+BOOTSCREEN_RENDER_VERSION = 1
+BOOTSCREEN_TEMPLATE = "dashboard/bootstrap.html"
+BOOTSCREEN_STATIC_FILES = ("css/bootstrap.css", "img/bg_3.png")
+
+_cache = DiskCache(CACHE_DIR / "bootscreens", BOOTSCREEN_CACHE_BYTES)
+_locks_lock = threading.Lock()
+_locks: Dict[str, threading.Lock] = {}
+
+
+@lru_cache(maxsize=1)
+def _assets_digest() -> str:
+    """Hash of the template and static files the page is drawn from; once per process."""
+    h = hashlib.sha256()
+    h.update(str(BOOTSCREEN_RENDER_VERSION).encode())
+    origin = get_template(BOOTSCREEN_TEMPLATE).origin.name
+    paths = [origin] + [cast(Optional[str], finders.find(p)) for p in BOOTSCREEN_STATIC_FILES]
+    for path in paths:
+        h.update(b"\0")
+        if path:
+            h.update(Path(path).read_bytes())
+    return h.hexdigest()
+
+
+def bootscreen_key(data: BootScreenData) -> str:
+    """
+    Content address of a bootscreen: everything it shows except `updated_at`,
+    plus the assets it is drawn with.
+    """
+    payload = asdict(data)
+    payload.pop("updated_at", None)
+    h = hashlib.sha256(_assets_digest().encode())
+    h.update(json.dumps(payload, sort_keys=True, default=str).encode())
+    return h.hexdigest() + ".png"
+
+
+def _lock_for(key: str) -> threading.Lock:
+    with _locks_lock:
+        lock = _locks.get(key)
+        if lock is None:
+            lock = _locks[key] = threading.Lock()
+        return lock
+
+
+def get_bootscreen_png(display: Display) -> Path:
+    """
+    Path of the quantized bootscreen for `display`. Rendered through the
+    browser only when nothing with the same content was rendered before;
+    concurrent requests for the same screen in this process render it once.
+    The cached image keeps the "Updated" time of its first render.
+    """
+    key = bootscreen_key(get_bootscreen_data(display))
+    path = _cache.get_path(key)
+    if path is not None:
+        return path
+    with _lock_for(key):
+        path = _cache.get_path(key)
+        if path is not None:
+            return path
+        png = render_png(f"http://localhost:8000/bootstrap?pk={display.pk}") # TODO remove hardcoded value. Relative URL
+        return _cache.put(key, run_eink_pipeline_for_page_in_memory(png))
@@ -3,14 +3,13 @@ from dashboard.services.openai import openai_client
 from dashboard.constants import (
     IMAGE_DIR,
     IMAGE_EXTENSIONS,
-    MIME_BY_EXT,
 )
 from dashboard.jobs.image_processing_declaration import (
     ContentTypeClassification,
     QualityClassification,
     RenderDecision,
 )
-from dashboard.services.image_processing import file_to_base64
+from dashboard.services.image_processing import openai_payload_from_file
 from pathlib import Path
 import base64
 from pydantic import BaseModel
@@ -35,10 +34,12 @@ class ImageClassification(BaseModel):
     qualityClassificationExplanation: str
 
 
-def classify_image(path: str) -> ImageClassification | None:
+def classify_image(path: str, sha256: str | None = None) -> ImageClassification | None:
     """
     Upload an image and ask OpenAI to classify its suitability for e-ink portrait generation.
     Returns the model's text response.
+    The image is sent downscaled to what the model actually looks at; see
+    `openai_payload_from_file`.
     """
     p = Path(path)
     ext = p.suffix.lower()
@@ -46,9 +47,7 @@ def classify_image(path: str) -> ImageClassification | None:
         raise ValueError(
             f"Unsupported image extension: {ext}. Supported: {sorted(IMAGE_EXTENSIONS)}"
         )
-    # file_to_base64 automatically converts HEIC to JPG
-    mime = MIME_BY_EXT.get("jpg") if ext == 'heic' else MIME_BY_EXT.get(ext)
-    image_b64 = file_to_base64(p)
+    mime, image_b64 = openai_payload_from_file(p, sha256)
     response = openai_client.responses.parse(
         model="gpt-5",
         text_format=ImageClassification,
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+
+class DiskCache:
+    """
+    A directory of immutable files with LRU eviction by total size.
+
+    Keys map to file names directly, so callers put everything that
+    determines the content (content hash, size, format version) in the key.
+    A hit bumps the file's mtime; when the directory grows past `max_bytes`
+    the least recently used files are removed until it is back under
+    `EVICT_TO` of the limit. Writes go through a temp file and `os.replace`,
+    so several processes can share one directory.
+    """
+
+    EVICT_TO = 0.9
+
+    def __init__(self, directory: Path | str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None  # approximate; recounted on eviction
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / key
+
+    def get_path(self, key: str) -> Optional[Path]:
+        path = self.path_for(key)
+        try:
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            return None
+        return path
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:  # evicted by another process in between
+            return None
+
+    def put(self, key: str, data: bytes) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(key)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self._account(len(data))
+        return path
+
+    def _account(self, added: int) -> None:
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += added
+            if self._size > self.max_bytes:
+                self._size = self._evict()
+
+    def _entries(self) -> list[os.DirEntry]:
+        try:
+            with os.scandir(self.directory) as it:
+                return [e for e in it if e.is_file() and not e.name.startswith(".tmp-")]
+        except FileNotFoundError:
+            return []
+
+    def _scan_size(self) -> int:
+        return sum(e.stat().st_size for e in self._entries())
+
+    def _evict(self) -> int:
+        entries = []
+        for e in self._entries():
+            try:
+                st = e.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, e.path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * self.EVICT_TO)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        return total
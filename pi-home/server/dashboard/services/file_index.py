@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from django.db import transaction
+
+from dashboard.constants import IMAGE_DIR, IMAGE_EXTENSIONS
+from dashboard.models.photos import IndexedDirectory, IndexedFile, SourceImage
+
+# Generated output lives inside IMAGE_DIR; never feed it back as a source
+EXCLUDED_DIR_NAMES = {"variants", "dashboards"}
+# Keeps `IN (...)` lists and bulk statements well below SQLite's variable limit
+BATCH_SIZE = 500
+HASH_CHUNK_SIZE = 1024 * 1024
+# Perceptual hashes at most this many bits (of 64) apart are the same photo
+PHASH_MAX_DISTANCE = 8
+# Near-uniform images (black frames, blank scans) hash to almost all 0s or 1s
+# and would all match each other; only their exact hash is trusted
+PHASH_MIN_INFORMATIVE_BITS = 8
+
+T = TypeVar("T")
+
+# Overlapping CLASSIFY runs share the daemon process; their scans would both
+# see the same new files and collide on IndexedFile.path
+_scan_lock = threading.Lock()
+
+
+@dataclass
+class ScanResult:
+    dirs_listed: int = 0
+    dirs_skipped: int = 0
+    added: int = 0
+    changed: int = 0
+    moved: int = 0
+    removed: int = 0
+
+    def __str__(self) -> str:
+        return (
+            f"listed {self.dirs_listed} dirs, skipped {self.dirs_skipped} unchanged; "
+            f"{self.added} added, {self.changed} changed, {self.moved} moved, {self.removed} removed"
+        )
+
+
+def _chunks(items: List[T], size: int = BATCH_SIZE) -> Iterator[List[T]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _is_excluded_dir(name: str) -> bool:
+    return name.startswith(".") or name in EXCLUDED_DIR_NAMES
+
+
+def _is_image(name: str) -> bool:
+    return not name.startswith(".") and os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+
+
+def sha256_file(path: str | Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def scan_image_dir(root: str | Path = IMAGE_DIR, *, full: bool = False) -> ScanResult:
+    """
+    Bring the file index up to date with the tree under `root`.
+
+    A directory whose mtime is unchanged since the last scan still has the
+    same entries, so its files are not listed or stat'ed again; only its known
+    subdirectories are visited. Editing a file in place does not touch the
+    directory mtime, so such edits are only picked up with `full=True`.
+    A file that disappears and shows up elsewhere with the same inode and size
+    is treated as moved and keeps its hash and SourceImage.
+
+    Paths are built from `root` as configured, not resolved, so they match
+    the SourceImage paths stored before the index existed. Scans in this
+    process run one at a time.
+    """
+    with _scan_lock:
+        return _scan(os.fspath(root), full)
+
+
+def _scan(root: str, full: bool) -> ScanResult:
+    known_dirs: Dict[str, IndexedDirectory] = {d.path: d for d in IndexedDirectory.objects.all()}
+    known_children: Dict[str, List[str]] = {}
+    for p in known_dirs:
+        known_children.setdefault(os.path.dirname(p), []).append(p)
+
+    result = ScanResult()
+    seen_dirs: set[str] = set()
+    listed_dirs: Dict[str, int] = {}  # path -> mtime_ns at listing time
+    found: Dict[str, os.stat_result] = {}  # image files in listed dirs
+
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        try:
+            # Stat before listing: anything added meanwhile bumps the mtime again
+            mtime_ns = os.stat(d).st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        seen_dirs.add(d)
+        known = known_dirs.get(d)
+        if not full and known is not None and known.mtime_ns == mtime_ns:
+            result.dirs_skipped += 1
+            stack.extend(known_children.get(d, []))
+            continue
+        try:
+            with os.scandir(d) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not _is_excluded_dir(entry.name):
+                            stack.append(entry.path)
+                    elif entry.is_file() and _is_image(entry.name):
+                        found[entry.path] = entry.stat()
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+        listed_dirs[d] = mtime_ns
+        result.dirs_listed += 1
+
+    # Files of vanished directories take part in move detection, so renaming
+    # a folder does not look like deleting and re-adding all of its photos.
+    gone_dirs = [p for p in known_dirs if p not in seen_dirs]
+    indexed: Dict[str, IndexedFile] = {}
+    for chunk in _chunks([*listed_dirs, *gone_dirs]):
+        for f in IndexedFile.objects.filter(directory__path__in=chunk):
+            indexed[f.path] = f
+
+    missing = {p: f for p, f in indexed.items() if p not in found}
+    missing_by_identity = {(f.inode, f.size): f for f in missing.values()}
+    new_paths: List[str] = []
+    moved: List[tuple[IndexedFile, str]] = []
+    changed: List[IndexedFile] = []
+    for path, st in found.items():
+        f = indexed.get(path)
+        if f is None:
+            twin = missing_by_identity.pop((st.st_ino, st.st_size), None)
+            if twin is not None:
+                moved.append((twin, path))
+                del missing[twin.path]
+            else:
+                new_paths.append(path)
+        elif (f.size, f.mtime_ns, f.inode) != (st.st_size, st.st_mtime_ns, st.st_ino):
+            f.size, f.mtime_ns, f.inode = st.st_size, st.st_mtime_ns, st.st_ino
+            f.sha256 = None  # content may differ; rehash when needed
+            changed.append(f)
+
+    with transaction.atomic():
+        dirs = _save_directories(known_dirs, listed_dirs)
+
+        for chunk in _chunks([f.pk for f in missing.values()]):
+            IndexedFile.objects.filter(pk__in=chunk).delete()
+
+        for f, new_path in moved:
+            old_path = f.path
+            st = found[new_path]
+            f.path, f.directory, f.mtime_ns = new_path, dirs[os.path.dirname(new_path)], st.st_mtime_ns
+            if f.source_image_id:
+                SourceImage.objects.filter(pk=f.source_image_id, path=old_path).update(path=new_path)
+        IndexedFile.objects.bulk_update(
+            [f for f, _ in moved] + changed,
+            ["path", "directory", "size", "mtime_ns", "inode", "sha256"],
+            batch_size=BATCH_SIZE,
+        )
+
+        for chunk in _chunks(gone_dirs):
+            IndexedDirectory.objects.filter(path__in=chunk).delete()
+
+        for chunk in _chunks(new_paths):
+            # Paths classified before the index existed keep their SourceImage
+            classified = dict(SourceImage.objects.filter(path__in=chunk).values_list("path", "pk"))
+            IndexedFile.objects.bulk_create([
+                IndexedFile(
+                    path=path,
+                    directory=dirs[os.path.dirname(path)],
+                    size=found[path].st_size,
+                    mtime_ns=found[path].st_mtime_ns,
+                    inode=found[path].st_ino,
+                    source_image_id=classified.get(path),
+                )
+                for path in chunk
+            ])
+
+    result.added = len(new_paths)
+    result.changed = len(changed)
+    result.moved = len(moved)
+    result.removed = len(missing)
+    return result
+
+
+def _save_directories(
+    known_dirs: Dict[str, IndexedDirectory],
+    listed_dirs: Dict[str, int],
+) -> Dict[str, IndexedDirectory]:
+    """Persist listed directories. Returns listed path -> row."""
+    dirs: Dict[str, IndexedDirectory] = {}
+    to_update: List[IndexedDirectory] = []
+    to_create: List[IndexedDirectory] = []
+    for path, mtime_ns in listed_dirs.items():
+        d = known_dirs.get(path)
+        if d is None:
+            d = IndexedDirectory(path=path, mtime_ns=mtime_ns)
+            to_create.append(d)
+        else:
+            d.mtime_ns = mtime_ns
+            to_update.append(d)
+        dirs[path] = d
+    IndexedDirectory.objects.bulk_update(to_update, ["mtime_ns"], batch_size=BATCH_SIZE)
+    # SQLite returns primary keys from bulk_create, so the rows can be used as FKs right away
+    IndexedDirectory.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+    return dirs
+
+
+def phash_distance(a: str, b: str) -> int:
+    return (int(a, 16) ^ int(b, 16)).bit_count()
+
+
+def is_informative(phash: Optional[str]) -> bool:
+    if not phash:
+        return False
+    ones = int(phash, 16).bit_count()
+    return PHASH_MIN_INFORMATIVE_BITS <= ones <= len(phash) * 4 - PHASH_MIN_INFORMATIVE_BITS
+
+
+def is_duplicate(sha_a: Optional[str], phash_a: Optional[str], sha_b: Optional[str], phash_b: Optional[str]) -> bool:
+    if sha_a and sha_a == sha_b:
+        return True
+    if not (is_informative(phash_a) and is_informative(phash_b)):
+        return False
+    return phash_distance(phash_a, phash_b) <= PHASH_MAX_DISTANCE
+
+
+class DuplicateFinder:
+    """
+    Finds the SourceImage a file duplicates: first by exact content hash,
+    then by nearest perceptual hash. Perceptual hashes are loaded once, so
+    create one per job run.
+    """
+
+    def __init__(self, max_distance: int = PHASH_MAX_DISTANCE):
+        self.max_distance = max_distance
+        self._phashes: Optional[List[Tuple[int, int]]] = None  # (source image pk, hash)
+
+    def _known_phashes(self) -> List[Tuple[int, int]]:
+        if self._phashes is None:
+            self._phashes = [
+                (pk, int(phash, 16))
+                for pk, phash in SourceImage.objects.exclude(phash=None).values_list("pk", "phash")
+                if is_informative(phash)
+            ]
+        return self._phashes
+
+    def find(self, sha256: Optional[str], phash: Optional[str]) -> Optional[int]:
+        if sha256:
+            pk = SourceImage.objects.filter(sha256=sha256).values_list("pk", flat=True).first()
+            if pk is not None:
+                return pk
+        if not is_informative(phash):
+            return None
+        value = int(phash, 16)
+        best_pk, best = None, self.max_distance + 1
+        for pk, known in self._known_phashes():
+            distance = (value ^ known).bit_count()
+            if distance < best:
+                best_pk, best = pk, distance
+        return best_pk
+
+    def add(self, source_image_pk: int, phash: Optional[str]) -> None:
+        if is_informative(phash) and self._phashes is not None:
+            self._phashes.append((source_image_pk, int(phash, 16)))
+
+
+def files_to_classify(limit: int) -> List[IndexedFile]:
+    """A random sample of indexed files that have no SourceImage yet."""
+    return list(IndexedFile.objects.filter(source_image__isnull=True).order_by("?")[:limit])
+
+
+def ensure_hashed(files: Iterable[IndexedFile]) -> None:
+    """Fill in missing content hashes. Hashing is deferred to here so scans stay stat-only."""
+    hashed: List[IndexedFile] = []
+    for f in files:
+        if f.sha256:
+            continue
+        try:
+            f.sha256 = sha256_file(f.path)
+        except FileNotFoundError:
+            continue
+        hashed.append(f)
+    IndexedFile.objects.bulk_update(hashed, ["sha256"], batch_size=BATCH_SIZE)
@@ -3,7 +3,8 @@ from PIL import Image
 from pathlib import Path
 from django.template import Context, Template
 from dashboard.services.openai import openai_client
-from dashboard.services.image_processing import pil_to_base64, base64_to_pil
+from dashboard.services.image_processing import openai_payload_from_image, base64_to_pil, load_working_copy
+from dashboard.constants import OPENAI_INPUT_MAX_SHORT_SIDE
 from dashboard.jobs.image_processing_declaration import ART_STYLE_CHOICES, CONTENT_TYPE_MARKDOWN, CONTENT_TYPE_CLASSIFICATION_CHOICES, PipelineArgs, PipelineSteps, ArtStyle
 from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple
 from dataclasses import dataclass, field
@@ -11,8 +12,11 @@ from pydantic import BaseModel
 from PIL import Image
 from dashboard.services.classify_image import ImageClassification
 from io import BytesIO
+from dashboard.services.quantize import quantize, Dither, Distance
+from dashboard.services.palette import PaletteLike
 
 RGB = Tuple[int, int, int]
+DEFAULT_RESOLUTION: Tuple[int, int] = (1200, 1600)
 ART_GENERATOR_PROMPT_TEMPLATE = Template(
     (
         Path(__file__).resolve().parent.parent
@@ -97,15 +101,7 @@ def openai_process(
         }
     )
 
-    has_alpha = image.mode in ("RGBA", "LA", "P") and (
-        "A" in image.getbands() or "transparency" in image.info
-    )
-    if has_alpha:
-        fmt, mime, img_to_send = "PNG", "image/png", image
-    else:
-        fmt, mime, img_to_send = "JPEG", "image/jpeg", image.convert("RGB")
-
-    b64 = pil_to_base64(img_to_send, format=fmt)
+    mime, b64 = openai_payload_from_image(image)
 
     # TODO error handling?
     response = openai_client.responses.create(
@@ -138,7 +134,7 @@ def openai_process(
 
 # Pipeline function
 def resize_crop(image: Image.Image, resolution: Tuple[int,int] | None, *, context: ImageProcessingContext) -> Image.Image:
-    defaulted_resolution = (1200,1600) if resolution is None else resolution
+    defaulted_resolution = DEFAULT_RESOLUTION if resolution is None else resolution
     target_w, target_h = defaulted_resolution
     src_w, src_h = image.size
 
@@ -209,31 +205,25 @@ def build_palette_list(
     return out
 
 
-def _build_P_mode_palette_image(colors: Sequence[RGB]) -> Image.Image:
-    if len(colors) > 256:
-        raise ValueError("Pillow palettes support max 256 colors.")
-    flat = []
-    for r, g, b in colors:
-        flat.extend([int(r), int(g), int(b)])
-    while len(flat) < 256 * 3:
-        flat.extend([0, 0, 0])
-    pal = Image.new("P", (1, 1))
-    pal.putpalette(flat)
-    return pal
-
 # Pipeline function
-def quantize_to_palette(img: Image.Image, colors: Sequence[RGB], *, context: Dict) -> Image.Image:
+def quantize_to_palette(
+    img: Image.Image,
+    palette: PaletteLike,
+    dither: Dither = "none",
+    distance: Distance = "rgb",
+    *,
+    context: Dict,
+) -> Image.Image:
     """
-    Remap `img` to `colors` using Pillow's fixed-palette quantizer (no dithering),
-    then convert back to RGB. Keeps everything crisp and returns RGB.
+    Remap `img` to `palette` (a name from color_constants.PALETTES, a Palette
+    or raw RGB tuples) through its cached lookup table and return RGB.
+    Defaults keep the crisp, undithered RGB-nearest look;
+    pipelines can pass a dither ("ordered", "floyd-steinberg", "atkinson")
+    and "lab" distance as extra args.
     """
     if not isinstance(img, Image.Image):
         raise TypeError("img must be a PIL.Image.Image")
-
-    base = img.convert("RGB")
-    pal = _build_P_mode_palette_image(colors)
-    q = base.quantize(palette=pal, dither=Image.Dither.NONE)  # P-mode
-    return q.convert("RGB")
+    return quantize(img, palette, dither, distance)
 
 
 class PipelineError(RuntimeError):
@@ -260,15 +250,28 @@ def get_pipeline_function(functionName: str) -> Callable:
     return result
 
 
+def _input_cover(context: ImageProcessingContext) -> Tuple[int, int] | None:
+    """The smallest input size the first pipeline step can use without upscaling."""
+    if not context.pipeline:
+        return None
+    step = context.pipeline[0]
+    args = context.pipeline_args[0] if context.pipeline_args else None
+    if step == "resize_crop":
+        return (args[0] if args and args[0] else None) or DEFAULT_RESOLUTION
+    if step == "openai_process":
+        return (OPENAI_INPUT_MAX_SHORT_SIDE, OPENAI_INPUT_MAX_SHORT_SIDE)
+    return None
+
+
 def run_art_generation_pipeline(
-    input: Union[Path, str, bytes],
+    input: Union[Path, str, bytes, Image.Image],
     *,
     context: ImageProcessingContext,
 ) -> None:
     """
     Execute an image-processing pipeline.
 
-    - Loads the input image first.
+    - Loads the input image first (a path, encoded bytes, or an already decoded Image).
     - Runs all steps except the last sequentially, each returning a new Image.Image.
     - Calls the final step separately; it must save to `output` and return None.
 
@@ -278,14 +281,16 @@ def run_art_generation_pipeline(
     - `pipeline_args[i]` supplies the positional args tuple for `pipeline[i]` (excluding `img`, `context`, and for the
       final step also excluding `output_path`, which is injected here).
     """
-    def _get_PIL(input: Union[Path, str, bytes]):
+    def _get_PIL(input: Union[Path, str, bytes, Image.Image]):
+        if isinstance(input, Image.Image):
+            return input
         if isinstance(input, bytes):
             with BytesIO(input) as bytebuyffer:
                 img = Image.open(bytebuyffer)
                 img.load()
             return img
         in_path = Path(cast(Union[str, Path], input))
-        return Image.open(in_path)
+        return load_working_copy(in_path, cover=_input_cover(context))
 
     img = _get_PIL(input)
 
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from django.db import close_old_connections
+from django.http import HttpRequest
+from django.utils import timezone
+
+from dashboard.models.schedule import Display
+
+logger = logging.getLogger(__name__)
+
+# Pending heartbeats are written to the database at most this often
+HEARTBEAT_FLUSH_SECS = 30.0
+# A display whose stored last_seen is younger than this (and whose IP and
+# user agent are unchanged) is not queued at all
+HEARTBEAT_MIN_AGE_SECS = 60.0
+
+HEARTBEAT_FIELDS = ["last_seen", "last_ip", "last_user_agent"]
+
+
+@dataclass
+class _Beat:
+    last_seen: datetime
+    ip: Optional[str]
+    user_agent: str
+
+
+def _client_ip(request: HttpRequest) -> Optional[str]:
+    # nginx sets X-Real-IP; without it (runserver) the socket peer is the client
+    return request.META.get("HTTP_X_REAL_IP") or request.META.get("REMOTE_ADDR") or None
+
+
+class HeartbeatTracker:
+    """
+    Coalesces display heartbeats in memory and writes them with one bulk
+    UPDATE per flush, off the request path.
+
+    A request only compares against the Display row it already loaded for
+    authentication, so recent, unchanged heartbeats cost no database work at
+    all. Each process (gunicorn worker) flushes its own heartbeats, so the
+    stored values can lag by up to HEARTBEAT_FLUSH_SECS.
+    """
+
+    def __init__(self, flush_secs: float = HEARTBEAT_FLUSH_SECS, min_age_secs: float = HEARTBEAT_MIN_AGE_SECS):
+        self.flush_secs = flush_secs
+        self.min_age = timedelta(seconds=min_age_secs)
+        self._lock = threading.Lock()
+        self._pending: Dict[int, _Beat] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record(self, display: Display, request: HttpRequest, now: Optional[datetime] = None) -> None:
+        now = now or timezone.now()
+        beat = _Beat(now, _client_ip(request), request.META.get("HTTP_USER_AGENT", "")[:255])
+        unchanged = beat.ip == display.last_ip and beat.user_agent == display.last_user_agent
+        if unchanged and display.last_seen is not None and now - display.last_seen < self.min_age:
+            return
+        with self._lock:
+            self._pending[display.pk] = beat
+            self._ensure_thread()
+        # Keep the in-memory instance consistent for the rest of the request
+        display.last_seen, display.last_ip, display.last_user_agent = beat.last_seen, beat.ip, beat.user_agent
+
+    def flush(self) -> int:
+        """Write pending heartbeats; returns how many displays were updated."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        displays = [
+            Display(pk=pk, last_seen=b.last_seen, last_ip=b.ip, last_user_agent=b.user_agent)
+            for pk, b in pending.items()
+        ]
+        try:
+            Display.objects.bulk_update(displays, HEARTBEAT_FIELDS)
+        except Exception:
+            logger.exception("Failed to write %d display heartbeats", len(displays))
+            with self._lock:
+                # Retry next time unless a newer heartbeat came in meanwhile
+                for pk, b in pending.items():
+                    self._pending.setdefault(pk, b)
+            return 0
+        return len(displays)
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        self.flush()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="heartbeat-flush", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_secs):
+            close_old_connections()
+            self.flush()
+
+
+_tracker = HeartbeatTracker()
+atexit.register(_tracker.shutdown)
+
+
+def record_heartbeat(display: Display, request: HttpRequest) -> None:
+    _tracker.record(display, request)
+
+
+def flush_heartbeats() -> int:
+    return _tracker.flush()
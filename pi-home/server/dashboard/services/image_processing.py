@@ -1,7 +1,22 @@
 from pathlib import Path
-from PIL import Image
+from typing import Optional, Tuple
+from PIL import Image, ImageOps
 import base64
+import hashlib
 import io
+import os
+
+from dashboard.constants import (
+    CACHE_DIR,
+    OPENAI_INPUT_MAX_SHORT_SIDE,
+    OPENAI_INPUT_MAX_LONG_SIDE,
+    OPENAI_INPUT_JPEG_QUALITY,
+    OPENAI_PAYLOAD_CACHE_BYTES,
+    PROXY_LONG_SIDES,
+    PROXY_CACHE_BYTES,
+)
+from dashboard.services.disk_cache import DiskCache
+from dashboard.services.file_index import sha256_file
 
 try:
     from pillow_heif import register_heif_opener  # type: ignore
@@ -57,3 +72,165 @@ def pil_to_base64(image: Image.Image, format: str = "PNG", **save_kwargs) -> str
 
 def base64_to_pil(b64: str) -> Image.Image:
     return Image.open(io.BytesIO(base64.b64decode(b64))).convert("RGBA")
+
+
+_payload_cache = DiskCache(CACHE_DIR / "openai_payloads", OPENAI_PAYLOAD_CACHE_BYTES)
+_proxy_cache = DiskCache(CACHE_DIR / "proxies", PROXY_CACHE_BYTES)
+
+# EXIF orientations that swap width and height
+_TRANSPOSING_ORIENTATIONS = {5, 6, 7, 8}
+
+
+def oriented_size(img: Image.Image) -> Tuple[int, int]:
+    """Size after EXIF orientation is applied. Reads only the header."""
+    w, h = img.size
+    if img.getexif().get(0x0112) in _TRANSPOSING_ORIENTATIONS:
+        return h, w
+    return w, h
+
+
+def image_oriented_size(path: Path | str) -> Tuple[int, int]:
+    with Image.open(path) as img:
+        return oriented_size(img)
+
+
+def _proxy_long_side(size: Tuple[int, int], cover: Optional[Tuple[int, int]]) -> Optional[int]:
+    """Smallest canonical long side whose proxy still covers `cover`; None means use the original."""
+    if cover is None:
+        return None
+    w, h = size
+    needed = max(cover[0] / w, cover[1] / h) * max(w, h)
+    for long_side in PROXY_LONG_SIDES:
+        if needed <= long_side < max(w, h):
+            return long_side
+    return None
+
+
+def _proxy_key(path: Path | str, long_side: int) -> str:
+    # Keyed by file identity rather than content so a hit never reads the original
+    st = os.stat(path)
+    ident = hashlib.sha1(f"{os.path.abspath(path)}\0{st.st_size}\0{st.st_mtime_ns}".encode()).hexdigest()
+    return f"{ident}-{long_side}.png"
+
+
+def _working_mode(img: Image.Image) -> str:
+    has_alpha = "A" in img.getbands() or "transparency" in img.info
+    return "RGBA" if has_alpha else "RGB"
+
+
+def load_working_copy(path: Path | str, cover: Optional[Tuple[int, int]] = None) -> Image.Image:
+    """
+    Decoded, EXIF-transposed RGB(A) copy of an image file that is at least
+    `cover` (width, height) in both directions, or full resolution without `cover`.
+
+    Downscaled copies come from a disk cache of PNG proxies at PROXY_LONG_SIDES,
+    so repeated runs over a source skip the HEIC/JPEG decode. On a miss JPEGs
+    are decoded in draft mode at the smallest DCT scale that is big enough.
+    """
+    with Image.open(path) as img:
+        size = oriented_size(img)
+        long_side = _proxy_long_side(size, cover)
+        if long_side is None:
+            out = ImageOps.exif_transpose(img)
+            return out.convert(_working_mode(out))
+
+        key = _proxy_key(path, long_side)
+        cached = _proxy_cache.get_path(key)
+        if cached is not None:
+            try:
+                with Image.open(cached) as proxy:
+                    proxy.load()
+                    return proxy.copy()
+            except (FileNotFoundError, OSError):
+                pass  # evicted or truncated; rebuild below
+
+        scale = long_side / max(size)
+        img.draft("RGB", (round(img.size[0] * scale), round(img.size[1] * scale)))
+        out = ImageOps.exif_transpose(img)
+        out.thumbnail((long_side, long_side), Image.Resampling.LANCZOS)
+        out = out.convert(_working_mode(out))
+
+    buf = io.BytesIO()
+    out.save(buf, format="PNG", compress_level=1)  # favour decode/encode speed over size
+    _proxy_cache.put(key, buf.getvalue())
+    return out
+
+
+def openai_input_size(size: Tuple[int, int]) -> Tuple[int, int]:
+    """The largest size OpenAI still uses at detail "high"; never upscales."""
+    w, h = size
+    scale = min(
+        1.0,
+        OPENAI_INPUT_MAX_SHORT_SIDE / max(1, min(w, h)),
+        OPENAI_INPUT_MAX_LONG_SIDE / max(1, max(w, h)),
+    )
+    return max(1, round(w * scale)), max(1, round(h * scale))
+
+
+def downscale_for_openai(image: Image.Image) -> Image.Image:
+    target = openai_input_size(image.size)
+    if target == image.size:
+        return image
+    image = image.copy()
+    image.thumbnail(target, Image.Resampling.LANCZOS)
+    return image
+
+
+def openai_payload_from_image(image: Image.Image) -> Tuple[str, str]:
+    """(mime, base64) of a downscaled copy; PNG when there is transparency, JPEG otherwise."""
+    image = downscale_for_openai(image)
+    has_alpha = image.mode in ("RGBA", "LA", "P") and (
+        "A" in image.getbands() or "transparency" in image.info
+    )
+    if has_alpha:
+        return "image/png", pil_to_base64(image, format="PNG")
+    return "image/jpeg", pil_to_base64(image.convert("RGB"), format="JPEG", quality=OPENAI_INPUT_JPEG_QUALITY)
+
+
+def _payload_key(sha256: str) -> str:
+    return (
+        f"{sha256}-{OPENAI_INPUT_MAX_SHORT_SIDE}x{OPENAI_INPUT_MAX_LONG_SIDE}"
+        f"-q{OPENAI_INPUT_JPEG_QUALITY}.jpg"
+    )
+
+
+def openai_payload_from_file(path: Path | str, sha256: str | None = None) -> Tuple[str, str]:
+    """
+    (mime, base64) JPEG of an image file at OpenAI's effective resolution.
+
+    The image comes from the proxy cache (see `load_working_copy`) rather
+    than a full-resolution decode. The encoded bytes are cached on disk by content hash; pass
+    `sha256` when it is already known to skip hashing the file.
+    """
+    if sha256 is None:
+        sha256 = sha256_file(path)
+    key = _payload_key(sha256)
+    data = _payload_cache.get(key)
+    if data is None:
+        img = load_working_copy(path, cover=(OPENAI_INPUT_MAX_SHORT_SIDE, OPENAI_INPUT_MAX_SHORT_SIDE))
+        img = downscale_for_openai(img).convert("RGB")
+        buf = io.BytesIO()
+        img.save(buf, format="JPEG", quality=OPENAI_INPUT_JPEG_QUALITY)
+        data = buf.getvalue()
+        _payload_cache.put(key, data)
+    return "image/jpeg", base64.b64encode(data).decode("utf-8")
+
+
+def perceptual_hash(path: Path | str, hash_size: int = 8) -> str:
+    """
+    Difference hash (dHash) as hex: one bit per horizontally adjacent pixel
+    pair of a tiny grayscale thumbnail. Survives re-encoding, resizing and
+    EXIF rotation; compare two hashes by Hamming distance.
+    """
+    with Image.open(path) as img:
+        img.draft("L", (hash_size * 8, hash_size * 8))  # JPEG: decode at reduced scale
+        img = ImageOps.exif_transpose(img)
+        small = img.convert("L").resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS)
+    px = small.tobytes()
+    bits = 0
+    for y in range(hash_size):
+        row = px[y * (hash_size + 1):(y + 1) * (hash_size + 1)]
+        for x in range(hash_size):
+            bits = (bits << 1) | (row[x] > row[x + 1])
+    return f"{bits:0{hash_size * hash_size // 4}x}"
+
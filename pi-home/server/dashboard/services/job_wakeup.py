@@ -0,0 +1,18 @@
+from django.conf import settings
+import socket
+
+JOB_WAKEUP_PORT = getattr(settings, "JOB_WAKEUP_PORT", 51235)
+WAKEUP_MESSAGE = b"JOBS_WAKEUP"
+
+
+def notify_job_daemon() -> None:
+    """
+    Tell the daemon there is new work in the Execution queue.
+    Best effort: if the daemon is not running the datagram is simply dropped
+    and the execution is picked up on the next minute tick.
+    """
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.sendto(WAKEUP_MESSAGE, ("127.0.0.1", JOB_WAKEUP_PORT))
+    except OSError as e:
+        print(f"[job_wakeup] could not notify daemon: {e!r}")
@@ -1,11 +1,21 @@
 from dataclasses import dataclass, field
-from typing import Optional, Dict, Any, cast
+from typing import Optional, Dict, Any, List, cast
 from django.utils import timezone
+from django.db import connection, transaction
+import logging
+import threading
 import traceback
 from dashboard.models.job import Job, JobLogEntry, Execution
 from dashboard.constants import RUNNING, QUEUED, SUCCESS, ERROR, JobKind
 
 MAX_LINES_PER_RUN = 500
+# Lines are buffered and written with one bulk INSERT once FLUSH_EVERY_LINES
+# are waiting, or by a timer at most FLUSH_INTERVAL_SECS after the first one,
+# so lines logged before a long OpenAI call or render still show up in time
+FLUSH_EVERY_LINES = 50
+FLUSH_INTERVAL_SECS = 2.0
+
+_console = logging.getLogger(__name__)
 
 @dataclass
 class RunLogger:
@@ -15,22 +25,49 @@ class RunLogger:
     _lines_written: int = 0
     _closed: bool = False
     _agg: Dict[str, int] = field(default_factory=dict)
+    _buffer: List[JobLogEntry] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+    _timer: Optional[threading.Timer] = None
 
     def _write(self, level: str, message: str, context: Optional[Dict[str, Any]] = None):
         if self._closed or self._lines_written >= MAX_LINES_PER_RUN:
             return
         self._seq += 1
         self._lines_written += 1
-        safeContext = context
-        # NOTE: either add a JSONField 'context' to JobLogEntry OR drop it here:
-        JobLogEntry.objects.create(
-            execution=self.execution,
-            level=level,
-            message=message,
-            seq=self._seq,
-            context=context
-        )
-        print(f"{level}:{message}")
+        _console.debug("%s:%s", level, message)
+        with self._lock:
+            # ts defaults to timezone.now() here, so buffering does not skew timestamps
+            self._buffer.append(JobLogEntry(
+                execution=self.execution,
+                level=level,
+                message=message,
+                seq=self._seq,
+                context=context
+            ))
+            full = len(self._buffer) >= FLUSH_EVERY_LINES
+            if not full and self._timer is None:
+                self._timer = threading.Timer(FLUSH_INTERVAL_SECS, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Write buffered lines to the database."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._buffer:
+                JobLogEntry.objects.bulk_create(self._buffer)
+                self._buffer = []
+
+    def _flush_from_timer(self):
+        try:
+            self.flush()
+        finally:
+            # The timer thread got its own connection; don't leave it open
+            connection.close()
 
     def debug(self, msg, **ctx): self._write("DEBUG", msg, ctx or None)
     def info(self, msg, **ctx):  self._write("INFO",  msg, ctx or None)
@@ -44,27 +81,36 @@ class RunLogger:
         now = timezone.now()
         self.execution.status = RUNNING
         self.execution.started_at = now
-        self.execution.save()
+        self.execution.save(update_fields=["status", "started_at", "updated_at"])
+
+    def _save_outcome(self):
+        # Execution and Job bookkeeping commit together, in one short transaction
+        with transaction.atomic():
+            self.execution.save(update_fields=[
+                "summary", "error", "status", "finished_at", "runtime_ms", "updated_at",
+            ])
+            self.job.save(update_fields=[
+                "last_run_status", "last_run_started_at", "last_run_finished_at", "updated_at",
+            ])
 
     def _close_success(self, summary: str = ""):
         if self._closed: return
-        self._closed = True
         now = timezone.now()
         started = self.execution.started_at or now
         self.execution.summary = summary[:500]
         self.execution.status = SUCCESS
         self.execution.finished_at = now
         self.execution.runtime_ms = int((now - started).total_seconds() * 1000)
-        self.execution.save()
         self.job.last_run_status = SUCCESS
         self.job.last_run_started_at = self.execution.started_at
         self.job.last_run_finished_at = self.execution.finished_at
-        self.job.save()
+        self._save_outcome()
         self.debug(f"Job Execution finished:\nSummary: {summary}")
+        self._closed = True
+        self.flush()
 
     def _close_error(self, exc: BaseException, summary: str = ""):
         if self._closed: return
-        self._closed = True
         now = timezone.now()
         tb = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
         self.execution.summary = (summary or str(exc))[:500]
@@ -73,9 +119,10 @@ class RunLogger:
         self.execution.finished_at = now
         started = self.execution.started_at or now
         self.execution.runtime_ms = int((now - started).total_seconds() * 1000)
-        self.execution.save()
         self.job.last_run_status = ERROR
         self.job.last_run_started_at = self.execution.started_at
         self.job.last_run_finished_at = self.execution.finished_at
-        self.job.save()
-        self.error(f"Job Execution error:\nSummary: {summary}\nTraceback: {tb}")
\ No newline at end of file
+        self._save_outcome()
+        self.error(f"Job Execution error:\nSummary: {summary}\nTraceback: {tb}")
+        self._closed = True
+        self.flush()
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Dict, Iterable, Sequence, Tuple, Union
+
+import numpy as np
+
+from dashboard.color_constants import PALETTES, extract_rgb_set
+
+RGB = Tuple[int, int, int]
+
+
+def rgb_to_lab(rgb: np.ndarray) -> np.ndarray:
+    """sRGB (0..255, any leading shape, last axis 3) to CIELAB under D65."""
+    c = np.asarray(rgb, dtype=np.float64) / 255.0
+    c = np.where(c > 0.04045, ((c + 0.055) / 1.055) ** 2.4, c / 12.92)
+    xyz = c @ np.array([
+        [0.4124564, 0.2126729, 0.0193339],
+        [0.3575761, 0.7151522, 0.1191920],
+        [0.1804375, 0.0721750, 0.9503041],
+    ])
+    xyz /= np.array([0.95047, 1.0, 1.08883])
+    f = np.where(xyz > (6 / 29) ** 3, np.cbrt(xyz), xyz / (3 * (6 / 29) ** 2) + 4 / 29)
+    return np.stack([
+        116 * f[..., 1] - 16,
+        500 * (f[..., 0] - f[..., 1]),
+        200 * (f[..., 1] - f[..., 2]),
+    ], axis=-1)
+
+
+def palette_array(colors: Sequence[RGB]) -> np.ndarray:
+    """Palette as a k x 3 uint8 array in a stable (sorted) order."""
+    arr = np.array(sorted({tuple(int(c) for c in rgb) for rgb in colors}), dtype=np.uint8)
+    if not 0 < len(arr) <= 256:
+        raise ValueError("A palette needs between 1 and 256 colors.")
+    return arr
+
+
+@dataclass(frozen=True, eq=False)
+class Palette:
+    """
+    An immutable palette, built once per process.
+
+    `colors` is in a stable (sorted) order, so `key` identifies the palette
+    across processes and restarts; the LUT caches in services.quantize key on
+    it. Derived structures are computed on first use and then kept.
+    """
+    name: str
+    colors: np.ndarray = field(repr=False)  # k x 3 uint8, read-only
+
+    @classmethod
+    def from_colors(cls, name: str, colors: Iterable[RGB]) -> "Palette":
+        arr = palette_array(list(colors))
+        arr.flags.writeable = False
+        return cls(name, arr)
+
+    @cached_property
+    def key(self) -> str:
+        return hashlib.sha1(self.colors.tobytes()).hexdigest()
+
+    @cached_property
+    def flat(self) -> bytes:
+        """768-byte buffer for `Image.putpalette`, padded with black."""
+        return self.colors.tobytes().ljust(768, b"\0")
+
+    @cached_property
+    def lab(self) -> np.ndarray:
+        return rgb_to_lab(self.colors)
+
+    @cached_property
+    def rgb(self) -> Tuple[RGB, ...]:
+        return tuple(tuple(int(c) for c in rgb) for rgb in self.colors)
+
+    def __len__(self) -> int:
+        return len(self.colors)
+
+
+PaletteLike = Union[str, Palette, Iterable[RGB]]
+
+_lock = threading.Lock()
+_named: Dict[str, Palette] = {}
+_anonymous: Dict[frozenset, Palette] = {}
+
+
+def get_palette(palette: PaletteLike) -> Palette:
+    """
+    Resolve a palette name (see color_constants.PALETTES), a Palette, or a raw
+    collection of RGB tuples to a shared Palette instance.
+    """
+    if isinstance(palette, Palette):
+        return palette
+    with _lock:
+        if isinstance(palette, str):
+            found = _named.get(palette)
+            if found is None:
+                if palette not in PALETTES:
+                    raise ValueError(f"Unknown palette {palette!r}. Known: {sorted(PALETTES)}")
+                found = _named[palette] = Palette.from_colors(palette, extract_rgb_set(PALETTES[palette]))
+            return found
+        # Raw colours, e.g. from older pipeline args
+        ident = frozenset(tuple(int(c) for c in rgb) for rgb in palette)
+        found = _anonymous.get(ident)
+        if found is None:
+            found = _anonymous[ident] = Palette.from_colors("custom", ident)
+        return found
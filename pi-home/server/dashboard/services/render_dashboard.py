@@ -0,0 +1,454 @@
+from __future__ import annotations
+
+import io
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple, TYPE_CHECKING, cast
+
+from django.contrib.staticfiles import finders
+from django.utils.timezone import localtime
+from PIL import Image, ImageDraw, ImageFont
+
+try:
+    # Needs the cairo system library as well; without it icons are left out
+    import cairosvg
+except (ImportError, OSError):
+    cairosvg = None
+
+logger = logging.getLogger(__name__)
+_warned_no_cairosvg = False
+
+if TYPE_CHECKING:
+    from dashboard.views.dashboard import (
+        DashboardCalendarView,
+        DashboardDisksView,
+        DashboardDockerHealthView,
+        DashboardHeaderView,
+        DashboardStatView,
+        DashboardViewData,
+        DashboardWeatherView,
+        GraphStatView,
+    )
+
+RGB = Tuple[int, int, int]
+Box = Tuple[int, int, int, int]
+Font = ImageFont.FreeTypeFont | ImageFont.ImageFont
+
+# Geometry of static/css/dashboard.css at its native 1200x1600
+BASE_W = 1200
+BASE_H = 1600
+UNITS_HIGH = 16  # --unit-height: 100vh / 16
+
+# Palette of static/css/dashboard.css (already e-ink friendly)
+COLORS: dict[str, RGB] = {
+    "red": (156, 72, 75),
+    "green": (58, 91, 70),
+    "blue": (61, 59, 94),
+    "yellow": (208, 190, 71),
+    "orange": (185, 118, 110),
+    "purple": (109, 66, 85),
+    "black": (0, 0, 0),
+    "white": (255, 255, 255),
+    "dark-grey": (81, 82, 83),
+    "grey": (161, 164, 165),
+    "very-light-grey": (242, 242, 242),
+    "light-grey": (208, 210, 210),
+    "light-blue": (158, 157, 175),
+}
+BG = COLORS["very-light-grey"]
+CARD_BG = COLORS["white"]
+TEXT = COLORS["black"]
+MUTED = COLORS["dark-grey"]
+RULE = COLORS["dark-grey"]
+GRID = COLORS["grey"]
+SHADOW = COLORS["light-grey"]
+
+FONT_REGULAR = "DejaVuSans.ttf"
+FONT_BOLD = "DejaVuSans-Bold.ttf"
+
+ICON_DIR = "svg/tabler/"
+WEATHER_ICON_DIR = "svg/weather-bas/"
+
+
+@lru_cache(maxsize=None)
+def _font(size: int, bold: bool = False) -> Font:
+    try:
+        return ImageFont.truetype(FONT_BOLD if bold else FONT_REGULAR, size)
+    except OSError:
+        return ImageFont.load_default(size)
+
+
+@lru_cache(maxsize=256)
+def _icon(static_path: str, size: int, color: Optional[RGB] = None) -> Optional[Image.Image]:
+    """
+    An SVG from the static files rasterised to an RGBA image, once per
+    (icon, size, colour). `currentColor` is replaced by `color`, like the CSS
+    does for inlined icons. None when the icon or cairosvg is unavailable.
+    """
+    global _warned_no_cairosvg
+    if cairosvg is None:
+        if not _warned_no_cairosvg:
+            logger.warning("cairosvg or the cairo library is not installed; dashboard icons are left out")
+            _warned_no_cairosvg = True
+        return None
+    abs_path = cast(Optional[str], finders.find(static_path, False))
+    if not abs_path:
+        return None
+    svg = Path(abs_path).read_text()
+    if color is not None:
+        svg = re.sub(r"currentColor", "rgb({},{},{})".format(*color), svg)
+    png = cairosvg.svg2png(bytestring=svg.encode(), output_width=size, output_height=size)
+    img = Image.open(io.BytesIO(png)).convert("RGBA")
+    img.load()
+    return img
+
+
+def _local(dt: datetime, fmt: str) -> str:
+    return localtime(dt).strftime(fmt)
+
+
+@dataclass
+class _Card:
+    draw_fn: Callable[["DashboardPainter", Box], None]
+    full_width: bool
+    units: int
+
+
+class DashboardPainter:
+    """
+    Draws DashboardViewData straight onto a Pillow canvas, following the layout
+    of templates/dashboard/dashboard.html: a wrapping row of cards whose heights
+    are multiples of 1/16 of the screen. Fonts and spacing scale with the canvas.
+    """
+
+    def __init__(self, width: int = BASE_W, height: int = BASE_H):
+        self.width = width
+        self.height = height
+        self.scale = min(width / BASE_W, height / BASE_H)
+        self.image = Image.new("RGB", (width, height), BG)
+        self.draw = ImageDraw.Draw(self.image)
+
+    def px(self, value: float) -> int:
+        return max(1, round(value * self.scale))
+
+    def font(self, size: float, bold: bool = False) -> Font:
+        return _font(self.px(size), bold)
+
+    # Primitives
+
+    def fit(self, text: str, font: Font, max_w: int) -> str:
+        """`text`, cut short with an ellipsis to fit `max_w` pixels."""
+        if self.draw.textlength(text, font=font) <= max_w:
+            return text
+        lo, hi = 0, len(text)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self.draw.textlength(text[:mid] + "…", font=font) <= max_w:
+                lo = mid
+            else:
+                hi = mid - 1
+        return text[:lo].rstrip() + "…"
+
+    def wrap(self, text: str, font: Font, max_w: int, max_lines: int) -> List[str]:
+        lines: List[str] = []
+        current = ""
+        for word in text.split():
+            candidate = f"{current} {word}".strip()
+            if self.draw.textlength(candidate, font=font) <= max_w or not current:
+                current = candidate
+                continue
+            lines.append(current)
+            current = word
+            if len(lines) == max_lines:
+                break
+        if current and len(lines) < max_lines:
+            lines.append(current)
+        if lines:
+            lines[-1] = self.fit(lines[-1], font, max_w)
+        return lines
+
+    def text(self, xy: Tuple[float, float], text: str, font: Font, fill: RGB = TEXT, anchor: str = "la") -> None:
+        self.draw.text(xy, text, font=font, fill=fill, anchor=anchor)
+
+    def line_height(self, font: Font) -> int:
+        ascent, descent = font.getmetrics() if isinstance(font, ImageFont.FreeTypeFont) else (font.size, 0)
+        return ascent + descent
+
+    def paste_icon(self, static_path: str, xy: Tuple[int, int], size: int, color: Optional[RGB] = None) -> bool:
+        icon = _icon(static_path, size, color)
+        if icon is None:
+            return False
+        self.image.paste(icon, xy, icon)
+        return True
+
+    def card(self, box: Box) -> Box:
+        """Card background with the offset shadow; returns the padded content box."""
+        x0, y0, x1, y1 = box
+        radius, shadow = self.px(12), self.px(5)
+        self.draw.rounded_rectangle((x0 + shadow, y0 + shadow, x1 + shadow, y1 + shadow), radius, fill=SHADOW)
+        self.draw.rounded_rectangle(box, radius, fill=CARD_BG)
+        return (x0 + self.px(10), y0 + self.px(8), x1 - self.px(10), y1 - self.px(8))
+
+    def section_header(self, box: Box, icon: str, title: str, note: str) -> int:
+        """Icon, title and a right-aligned note above a rule; returns the y below it."""
+        x0, y0, x1, _ = box
+        title_font, note_font = self.font(18, bold=True), self.font(13)
+        icon_size = self.px(22)
+        x = x0
+        if self.paste_icon(ICON_DIR + icon, (x, y0 + self.px(2)), icon_size, TEXT):
+            x += icon_size + self.px(6)
+        note_w = int(self.draw.textlength(note, font=note_font))
+        self.text((x, y0), self.fit(title, title_font, x1 - x - note_w - self.px(12)), title_font)
+        self.text((x1, y0 + self.px(4)), note, note_font, MUTED, anchor="ra")
+        y = y0 + self.line_height(title_font) + self.px(6)
+        self.draw.line((x0, y, x1, y), fill=RULE, width=self.px(2))
+        return y + self.px(8)
+
+    # Sections
+
+    def header(self, header: "DashboardHeaderView", box: Box) -> None:
+        inner = self.card(box)
+        y = self.section_header(
+            inner,
+            "home.svg",
+            "Dashboard - Fabiolapark 23 - Raspberry pi home server",
+            f"Generated {_local(header.generated_at, '%H:%M')}",
+        )
+        font = self.font(14)
+        if not header.alerts:
+            self.text((inner[0], y), "No alerts or messages", font, MUTED)
+            return
+        x = inner[0]
+        self.text((x, y), "Alerts:", font, MUTED)
+        x += int(self.draw.textlength("Alerts: ", font=font))
+        level_colors = {"info": COLORS["blue"], "warning": COLORS["orange"], "error": COLORS["red"]}
+        for alert in header.alerts:
+            message = self.fit(alert.message, font, inner[2] - x)
+            self.text((x, y), message, font, level_colors.get(alert.level, TEXT))
+            x += int(self.draw.textlength(message + "   ", font=font))
+            if x >= inner[2]:
+                break
+
+    def weather(self, weather: "DashboardWeatherView", box: Box) -> None:
+        inner = self.card(box)
+        y0 = self.section_header(inner, "sun.svg", "Weather", f"Updated: {_local(weather.updated_at, '%A %d/%m/%Y %H:%M')}")
+        if not weather.days:
+            self.text((inner[0], y0), "No forecast", self.font(14), MUTED)
+            return
+        x0, _, x1, y1 = inner
+        col_w = (x1 - x0) / len(weather.days)
+        title_font, big, small, tiny = self.font(16, True), self.font(30, True), self.font(14), self.font(12)
+        icon_size = self.px(96)
+        for i, day in enumerate(weather.days):
+            cx0 = int(x0 + i * col_w)
+            cx1 = int(x0 + (i + 1) * col_w) - self.px(8)
+            if i:
+                self.draw.line((cx0 - self.px(4), y0, cx0 - self.px(4), y1), fill=SHADOW, width=self.px(1))
+            y = y0
+            self.text((cx0, y), self.fit(day.label, title_font, cx1 - cx0), title_font)
+            y += self.line_height(title_font) + self.px(2)
+
+            if not (day.detail.icon and self.paste_icon(WEATHER_ICON_DIR + day.detail.icon, (cx0, y), icon_size)):
+                self.text((cx0, y + icon_size // 3), self.fit(day.detail.main, big, cx1 - cx0), big, MUTED)
+            self.text((cx1, y + self.px(8)), f"{day.percipitation_probability_pct}%", small, COLORS["blue"], anchor="ra")
+            self.text((cx1, y + self.px(36)), day.wind_dir_letters, small, COLORS["orange"], anchor="ra")
+            self.text((cx1, y + self.px(60)), f"{day.wind_speed_bft} Bft", small, anchor="ra")
+            y += icon_size + self.px(2)
+
+            self.text((cx0, y), f"{day.temp_day}°", big)
+            avg_w = int(self.draw.textlength(f"{day.temp_day}° ", font=big))
+            self.text((cx0 + avg_w, y), f"{day.temp_max}°", tiny, COLORS["red"])
+            self.text((cx0 + avg_w, y + self.px(16)), f"{day.temp_min}°", tiny, COLORS["blue"])
+            y += self.line_height(big) + self.px(2)
+            self.text((cx0, y), f"Feel: {day.feels_day}°", tiny, MUTED)
+            y += self.line_height(tiny) + self.px(4)
+
+            summary = f"{day.detail.description}, {day.wind_descr}"
+            for line in self.wrap(summary, tiny, cx1 - cx0, max(1, (y1 - y) // self.line_height(tiny))):
+                self.text((cx0, y), line, tiny, MUTED)
+                y += self.line_height(tiny)
+
+    def disks(self, disks: "DashboardDisksView", box: Box) -> None:
+        inner = self.card(box)
+        y0 = self.section_header(inner, "database.svg", "Disks", f"Updated: {_local(disks.updated_at, '%H:%M')}")
+        if not disks.disks:
+            return
+        x0, _, x1, y1 = inner
+        col_w = (x1 - x0) / len(disks.disks)
+        name_font, font = self.font(16, True), self.font(13)
+        ring = min(y1 - y0, self.px(110))
+        for i, disk in enumerate(disks.disks):
+            cx = int(x0 + i * col_w)
+            ring_box = (cx, y0, cx + ring, y0 + ring)
+            used_deg = 360.0 * disk.disk_used_percent / 100.0
+            self.draw.pieslice(ring_box, -90, 270, fill=COLORS["light-grey"])
+            if used_deg > 0:
+                self.draw.pieslice(ring_box, -90, -90 + used_deg, fill=COLORS["blue"])
+            hole = ring // 4
+            self.draw.ellipse((cx + hole, y0 + hole, cx + ring - hole, y0 + ring - hole), fill=CARD_BG)
+            self.text((cx + ring // 2, y0 + ring // 2), f"{disk.disk_used_percent:.0f}%", font, anchor="mm")
+
+            tx, tw = cx + ring + self.px(10), int(col_w) - ring - self.px(16)
+            y = y0 + self.px(8)
+            self.text((tx, y), self.fit(disk.disk_name, name_font, tw), name_font)
+            y += self.line_height(name_font) + self.px(4)
+            self.text((tx, y), self.fit(f"Used: {disk.used}", font, tw), font)
+            y += self.line_height(font)
+            self.text((tx, y), self.fit(f"Total: {disk.total}", font, tw), font)
+
+    def stat(self, stat: "DashboardStatView", box: Box) -> None:
+        inner = self.card(box)
+        y0 = self.section_header(inner, stat.stat_icon_path, stat.stat_title, f"Updated: {_local(stat.updated_at, '%H:%M')}")
+        self.line_graph((inner[0], y0, inner[2], inner[3]), stat.graph_data, _Y_FORMATS.get(stat.stat_id_and_grid, _format_plain))
+
+    def line_graph(self, box: Box, series: Sequence["GraphStatView"], y_format: Callable[[float], str]) -> None:
+        """All series on shared axes: x is minutes before now, y starts at zero."""
+        font = self.font(12)
+        values = [v for s in series for v in s.values if v is not None]
+        labels = [l for s in series for l in s.labels]
+        top = max(values) if values else 1.0
+        top = top * 1.1 if top > 0 else 1.0
+        x_min = min(labels) if labels else -60
+        x_max = max(0, max(labels) if labels else 0)
+        x_span = max(1, x_max - x_min)
+
+        x0, y0, x1, y1 = box
+        gx0 = x0 + max(int(self.draw.textlength(y_format(top), font=font)), self.px(24)) + self.px(6)
+        gy1 = y1 - self.line_height(font) - self.px(4)
+        gy0 = y0 + self.px(6)
+
+        for frac in (0.0, 0.5, 1.0):
+            gy = gy1 - (gy1 - gy0) * frac
+            self.draw.line((gx0, gy, x1, gy), fill=GRID, width=1)
+            self.text((gx0 - self.px(4), gy), y_format(top * frac), font, MUTED, anchor="rm")
+        for minute in (x_min, (x_min + x_max) // 2, x_max):
+            gx = gx0 + (x1 - gx0) * (minute - x_min) / x_span
+            self.text((gx, gy1 + self.px(4)), f"{minute}m" if minute else "now", font, MUTED, anchor="ma")
+
+        width = self.px(3)
+        for s in series:
+            color = COLORS.get(s.color, TEXT)
+            run: List[Tuple[float, float]] = []
+            for label, value in zip(s.labels, s.values):
+                if value is None:
+                    self._polyline(run, color, width)
+                    run = []
+                    continue
+                run.append((
+                    gx0 + (x1 - gx0) * (label - x_min) / x_span,
+                    gy1 - (gy1 - gy0) * (value / top),
+                ))
+            self._polyline(run, color, width)
+
+    def _polyline(self, points: List[Tuple[float, float]], color: RGB, width: int) -> None:
+        if len(points) > 1:
+            self.draw.line(points, fill=color, width=width, joint="curve")
+        elif points:
+            x, y = points[0]
+            self.draw.ellipse((x - width, y - width, x + width, y + width), fill=color)
+
+    def docker(self, docker: "DashboardDockerHealthView", box: Box) -> None:
+        inner = self.card(box)
+        y = self.section_header(inner, "brand-docker.svg", f"Docker ({docker.total_memory_used})", "")
+        font, bold = self.font(13), self.font(13, True)
+        health_colors = {"healthy": COLORS["green"], "unhealthy": COLORS["red"], "starting": COLORS["orange"]}
+        x0, _, x1, y1 = inner
+        for container in docker.containers:
+            if y + self.line_height(font) > y1:
+                break
+            state = container.status if container.health == "none" else container.health
+            self.text((x1, y), state, bold, health_colors.get(state, MUTED), anchor="ra")
+            state_w = int(self.draw.textlength(state, font=bold)) + self.px(8)
+            self.text((x0, y), self.fit(container.name, font, x1 - x0 - state_w), font)
+            y += self.line_height(font) + self.px(2)
+
+    def calendar(self, calendar: "DashboardCalendarView", box: Box) -> None:
+        inner = self.card(box)
+        y = self.section_header(inner, "calendar.svg", "Calendar", f"Updated: {_local(calendar.updated_at, '%H:%M')}")
+        x0, _, x1, y1 = inner
+        heading, time_font, title_font, small = self.font(16, True), self.font(13, True), self.font(13), self.font(12)
+        blocks = (("Today", calendar.today, "%H:%M", True), ("Later", calendar.rest, "%a %d/%m/%y %H:%M", False))
+        for name, items, fmt, details in blocks:
+            if y + self.line_height(heading) > y1:
+                return
+            self.text((x0, y), name, heading)
+            y += self.line_height(heading) + self.px(2)
+            if not items:
+                self.text((x0, y), "No events", title_font, MUTED)
+                y += self.line_height(title_font) + self.px(8)
+                continue
+            for item in items:
+                if y + self.line_height(title_font) > y1:
+                    return
+                end = f" - {_local(item.end, '%H:%M')}" if item.end else ""
+                when = f"{_local(item.start, fmt)}{end}: "
+                self.text((x0, y), when, time_font, MUTED)
+                tx = x0 + int(self.draw.textlength(when, font=time_font))
+                title = item.title if not (details and item.location) else f"{item.title} ({item.location})"
+                self.text((tx, y), self.fit(title, title_font, x1 - tx), title_font, MUTED if item.canceled else TEXT)
+                y += self.line_height(title_font)
+                if details and item.description and y + self.line_height(small) <= y1:
+                    self.text((x0 + self.px(8), y), self.fit(f"• {item.description}", small, x1 - x0 - self.px(8)), small, MUTED)
+                    y += self.line_height(small)
+                self.draw.line((x0, y + self.px(2), x1, y + self.px(2)), fill=SHADOW, width=1)
+                y += self.px(6)
+            y += self.px(4)
+
+    # Layout
+
+    def paint(self, data: "DashboardViewData") -> Image.Image:
+        cards: List[_Card] = []
+        if data.header:
+            cards.append(_Card(lambda p, b: p.header(data.header, b), True, 1))
+        if data.weather:
+            cards.append(_Card(lambda p, b: p.weather(data.weather, b), True, 3))
+        if data.disks:
+            cards.append(_Card(lambda p, b: p.disks(data.disks, b), False, 2))
+        if data.stats:
+            for stat in (data.stats.memory, data.stats.cpu, data.stats.network):
+                if stat:
+                    cards.append(_Card(lambda p, b, stat=stat: p.stat(stat, b), False, 3))
+        if data.docker:
+            cards.append(_Card(lambda p, b: p.docker(data.docker, b), False, 3))
+        if data.calendar:
+            cards.append(_Card(lambda p, b: p.calendar(data.calendar, b), False, 5))
+
+        for card, box in zip(cards, self._flow(cards)):
+            card.draw_fn(self, box)
+        return self.image
+
+    def _flow(self, cards: Iterable[_Card]) -> Iterable[Box]:
+        """Boxes for `cards`, wrapped into rows like the page's flex container."""
+        pad = gap = self.px(16)
+        unit = self.height / UNITS_HIGH
+        full_w = self.width - 2 * pad
+        half_w = (full_w - gap) // 2
+        x, y, row_h = pad, pad, 0
+        for card in cards:
+            w = full_w if card.full_width else half_w
+            h = int(unit * card.units)
+            if x > pad and x + w > self.width - pad:
+                x, y, row_h = pad, y + row_h + gap, 0
+            yield (x, y, x + w, y + h)
+            x += w + gap
+            row_h = max(row_h, h)
+
+
+def _format_plain(value: float) -> str:
+    return f"{value:.0f}" if value >= 10 else f"{value:.1f}"
+
+
+_Y_FORMATS: dict[str, Callable[[float], str]] = {
+    "memory": lambda v: f"{v / 1_000_000_000:.1f}",
+    "cpu": lambda v: f"{v:.0f}%",
+    "network": _format_plain,
+}
+
+
+def render_dashboard_image(data: "DashboardViewData", width: int = BASE_W, height: int = BASE_H) -> Image.Image:
+    """The dashboard as an RGB image, without a browser."""
+    return DashboardPainter(width, height).paint(data)
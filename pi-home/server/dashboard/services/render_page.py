@@ -1,21 +1,199 @@
-from playwright.sync_api import sync_playwright
+from __future__ import annotations
+
+import atexit
+import io
+import logging
+import queue
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple, cast
+
+import psutil
+from playwright.sync_api import Browser, BrowserContext, Page, Playwright, sync_playwright
+
 from dashboard.services.generate_art import run_art_generation_pipeline, ImageProcessingContext
 from dashboard.services.generate_art import ConsoleLogger
-from dashboard.color_constants import EXTENDED_PALETTE_SET
-from typing import cast
+from dashboard.color_constants import EXTENDED
+
+logger = logging.getLogger(__name__)
 
 DEFAULT_W = 1200
 DEFAULT_H = 1600
 
-def render_png(url: str,*, width=DEFAULT_W, height=DEFAULT_H,
-               wait_selector: str | None = None, extra_wait_ms: int = 0,
-               no_sandbox: bool = False) -> bytes:
-    launch_args = ["--disable-dev-shm-usage"]
-    if no_sandbox:
-        launch_args += ["--no-sandbox", "--disable-setuid-sandbox"]
-    
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True, args=launch_args)
+# A long-lived Chromium slowly leaks; start a fresh one after this many renders
+# or once the browser's processes use more than RENDER_MAX_RSS_BYTES.
+RENDER_MAX_RENDERS = 100
+RENDER_MAX_RSS_BYTES = 400 * 1024 * 1024
+# Close the browser after this long without work. Each process that renders
+# (the daemon and every gunicorn worker) has its own browser, so an idle one
+# should not sit on a few hundred MB.
+RENDER_IDLE_SECS = 120.0
+# How long a caller waits for its render, queueing included
+RENDER_TIMEOUT_SECS = 90.0
+# Keep a warm page for at most this many viewport sizes
+MAX_WARM_VIEWPORTS = 4
+
+# Injected into every document before its own styles load; add_style_tag on a
+# reused page would be dropped by the next navigation.
+_FREEZE_ANIMATIONS_SCRIPT = """
+document.addEventListener("DOMContentLoaded", () => {
+    const style = document.createElement("style");
+    style.textContent = `
+        * { animation: none !important; transition: none !important; }
+        html, body { overflow: hidden !important; }
+    `;
+    document.head.appendChild(style);
+});
+"""
+
+
+@dataclass
+class _RenderRequest:
+    url: str
+    width: int
+    height: int
+    wait_selector: Optional[str]
+    extra_wait_ms: int
+    no_sandbox: bool
+    future: Future = field(default_factory=Future)
+
+
+class BrowserRenderer:
+    """
+    Renders pages to PNG with one warm headless Chromium per process.
+
+    Playwright's sync API is bound to the thread that started it, so a single
+    worker thread owns the browser and serves requests from a queue; callers
+    block on a future. A context and page are kept per viewport size and
+    reused between renders. The browser is replaced after RENDER_MAX_RENDERS
+    renders, when its memory grows past RENDER_MAX_RSS_BYTES, after a failed
+    render, and closed entirely after RENDER_IDLE_SECS without work.
+    """
+
+    def __init__(
+        self,
+        max_renders: int = RENDER_MAX_RENDERS,
+        max_rss_bytes: int = RENDER_MAX_RSS_BYTES,
+        idle_secs: float = RENDER_IDLE_SECS,
+    ):
+        self.max_renders = max_renders
+        self.max_rss_bytes = max_rss_bytes
+        self.idle_secs = idle_secs
+        self._queue: "queue.Queue[Optional[_RenderRequest]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        # Owned by the worker thread only
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._browser_no_sandbox = False
+        self._pages: Dict[Tuple[int, int], Tuple[BrowserContext, Page]] = {}
+        self._renders = 0
+
+    def render(
+        self,
+        url: str,
+        *,
+        width: int = DEFAULT_W,
+        height: int = DEFAULT_H,
+        wait_selector: str | None = None,
+        extra_wait_ms: int = 0,
+        no_sandbox: bool = False,
+        timeout: float = RENDER_TIMEOUT_SECS,
+    ) -> bytes:
+        request = _RenderRequest(url, width, height, wait_selector, extra_wait_ms, no_sandbox)
+        self._ensure_worker()
+        self._queue.put(request)
+        try:
+            return request.future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # Still queued: the worker skips it. Already rendering: it finishes unused.
+            request.future.cancel()
+            raise
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        with self._lock:
+            thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join(timeout)
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="browser-renderer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            while True:
+                try:
+                    request = self._queue.get(timeout=self.idle_secs)
+                except queue.Empty:
+                    if self._browser is not None:
+                        logger.info("Closing idle browser")
+                        self._close()
+                    continue
+                if request is None:
+                    return
+                if not request.future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    request.future.set_result(self._render(request))
+                except BaseException as e:
+                    request.future.set_exception(e)
+                    # The browser may be wedged; start from scratch next time
+                    self._close()
+                else:
+                    self._renders += 1
+                    if self._should_recycle():
+                        self._close()
+        finally:
+            self._close()
+
+    def _should_recycle(self) -> bool:
+        if self._renders >= self.max_renders:
+            logger.info("Recycling browser after %d renders", self._renders)
+            return True
+        rss = self._browser_rss()
+        if rss > self.max_rss_bytes:
+            logger.info("Recycling browser using %d MiB", rss // (1024 * 1024))
+            return True
+        return False
+
+    @staticmethod
+    def _browser_rss() -> int:
+        """Resident memory of this process' children: the Playwright driver and Chromium."""
+        total = 0
+        for child in psutil.Process().children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+
+    def _ensure_browser(self, no_sandbox: bool) -> Browser:
+        if self._browser is not None and (not self._browser.is_connected() or self._browser_no_sandbox != no_sandbox):
+            self._close()
+        if self._browser is None:
+            launch_args = ["--disable-dev-shm-usage"]
+            if no_sandbox:
+                launch_args += ["--no-sandbox", "--disable-setuid-sandbox"]
+            self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch(headless=True, args=launch_args)
+            self._browser_no_sandbox = no_sandbox
+            self._renders = 0
+        return self._browser
+
+    def _page(self, browser: Browser, width: int, height: int) -> Page:
+        key = (width, height)
+        found = self._pages.get(key)
+        if found is not None:
+            return found[1]
+        if len(self._pages) >= MAX_WARM_VIEWPORTS:
+            oldest = next(iter(self._pages))
+            self._pages.pop(oldest)[0].close()
         context = browser.new_context(
             viewport={"width": width, "height": height},
             device_scale_factor=1,
@@ -24,32 +202,66 @@ def render_png(url: str,*, width=DEFAULT_W, height=DEFAULT_H,
             java_script_enabled=True,
             locale="en-US",
         )
+        context.add_init_script(_FREEZE_ANIMATIONS_SCRIPT)
         page = context.new_page()
+        self._pages[key] = (context, page)
+        return page
 
-        # Freeze animations
-        page.add_style_tag(content="""
-            * { animation: none !important; transition: none !important; }
-            html, body { overflow: hidden !important; }
-        """)
+    def _render(self, request: _RenderRequest) -> bytes:
+        browser = self._ensure_browser(request.no_sandbox)
+        page = self._page(browser, request.width, request.height)
 
-        page.goto(url, wait_until="networkidle", timeout=5_000)
-        if wait_selector:
-            page.wait_for_selector(wait_selector, state="visible", timeout=30_000)
+        page.goto(request.url, wait_until="networkidle", timeout=5_000)
+        if request.wait_selector:
+            page.wait_for_selector(request.wait_selector, state="visible", timeout=30_000)
 
         page.evaluate("() => new Promise(r => requestAnimationFrame(() => requestAnimationFrame(r)))")
-        if extra_wait_ms:
-            page.wait_for_timeout(extra_wait_ms)
+        if request.extra_wait_ms:
+            page.wait_for_timeout(request.extra_wait_ms)
+
+        return page.screenshot(full_page=False, omit_background=False, type="png")
+
+    def _close(self) -> None:
+        self._pages.clear()  # closing the browser closes its contexts
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except Exception:
+                logger.exception("Failed to close browser")
+            self._browser = None
+        if self._playwright is not None:
+            try:
+                self._playwright.stop()
+            except Exception:
+                logger.exception("Failed to stop Playwright")
+            self._playwright = None
+        self._renders = 0
+
+
+_renderer = BrowserRenderer()
+atexit.register(_renderer.shutdown)
+
+
+def get_renderer() -> BrowserRenderer:
+    return _renderer
+
+
+def render_png(url: str,*, width=DEFAULT_W, height=DEFAULT_H,
+               wait_selector: str | None = None, extra_wait_ms: int = 0,
+               no_sandbox: bool = False) -> bytes:
+    return _renderer.render(
+        url,
+        width=width,
+        height=height,
+        wait_selector=wait_selector,
+        extra_wait_ms=extra_wait_ms,
+        no_sandbox=no_sandbox,
+    )
 
-        png_bytes = page.screenshot(full_page=False, omit_background=False, type="png")
-        browser.close()
-        return png_bytes
-    
 def run_eink_pipeline_for_page_in_memory(png_bytes: bytes)-> bytes:
     ctx: ImageProcessingContext = ImageProcessingContext(
         logger=ConsoleLogger(),
         pipeline=["quantize_to_palette","output_bytes"],
-        pipeline_args=[(EXTENDED_PALETTE_SET,),("png",)],
+        pipeline_args=[(EXTENDED,),("png",)],
     )
-    return cast(bytes,run_art_generation_pipeline(png_bytes, context=ctx))
-
-    
\ No newline at end of file
+    return cast(io.BytesIO,run_art_generation_pipeline(png_bytes, context=ctx)).getvalue()
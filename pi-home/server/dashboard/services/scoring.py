@@ -19,7 +19,8 @@ from dashboard.jobs.image_processing_declaration import (
 from typing import Dict
 from django.utils import timezone
 from datetime import datetime
-from math import exp, log
+from math import exp, log, log2
+import numpy as np
 
 QUALITY_MAP: Dict[str,float] = {
     NOT_SUITED: 0.0,
@@ -132,4 +133,43 @@ def calculate_final_score(
     ):
         s *= val ** w
 
-    return max(0.0, min(s, 1.0))
\ No newline at end of file
+    return max(0.0, min(s, 1.0))
+
+
+def calculate_final_scores(
+    static_scores: np.ndarray,
+    favourites: np.ndarray,
+    created_at_ts: np.ndarray,
+    now_ts: float,
+) -> np.ndarray:
+    """
+    Vectorized `calculate_final_score` over whole columns at once.
+    `created_at_ts` and `now_ts` are POSIX timestamps in seconds.
+    """
+    epsilon = 1e-6
+    fav_scores = np.where(favourites, FAVOURITE_SCORE, 1.0 - FAVOURITE_SCORE)
+
+    age_days = np.maximum(now_ts - created_at_ts, 0.0) / 86400.0
+    decay = np.exp(-log(2) * (age_days / max(NOVELTY_HALF_LIFE_DAYS, 1e-6)))
+    novelty_scores = NOVELTY_FLOOR + (1.0 - NOVELTY_FLOOR) * decay
+
+    factors = [1.0, FAVOURITE_FACTOR, DATE_FACTOR]
+    total = sum(factors)
+    weights = [f / total for f in factors]
+
+    s = np.ones_like(static_scores, dtype=np.float64)
+    for vals, w in zip((static_scores, fav_scores, novelty_scores), weights):
+        s *= np.clip(vals, epsilon, 1.0) ** w
+
+    return np.clip(s, 0.0, 1.0)
+
+def novelty_stale_after_seconds(tolerance: float) -> float:
+    """
+    How long precomputed final scores stay within `tolerance` (relative) of the
+    live value. The novelty term moves fastest for brand-new items, so that is
+    the bound used.
+    """
+    span = 1.0 - NOVELTY_FLOOR
+    if span <= tolerance:
+        return float("inf")
+    return -NOVELTY_HALF_LIFE_DAYS * log2(1.0 - tolerance / span) * 86400.0
@@ -1,57 +1,208 @@
+from __future__ import annotations
 
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional, Tuple, TYPE_CHECKING
 
-from django.utils import timezone
+import numpy as np
+from django.db.models import Count, Max
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
-
-from dashboard.services.scoring import calculate_final_score
+from dashboard.services.scoring import calculate_final_scores, novelty_stale_after_seconds
 from dashboard.models.photos import Variant
-from typing import Iterable, List, Tuple
-import os
-import random
-import mimetypes
-from bisect import bisect
 
-def _weighted_choice(items: Iterable[Tuple[Variant, float]]) -> Variant:
+if TYPE_CHECKING:
+    from dashboard.models.schedule import Display
+
+# Only the best-scoring variants take part in the draw
+MAX_SAMPLED_VARIANTS = 10000
+
+# Signals only reach the process that saved the Variant (jobs run in the
+# daemon, requests are served by several gunicorn workers). Every so often
+# compare a cheap fingerprint of the table to pick up foreign changes.
+FINGERPRINT_CHECK_SECS = 30.0
+
+# Rebuild once novelty decay could have moved any weight by more than this
+# fraction since the table was built.
+NOVELTY_TOLERANCE = 0.01
+
+# A display does not get a variant again until this many others were shown to
+# it (capped for small libraries so a draw always has something left).
+RECENT_HISTORY_SIZE = 10
+# Rejection sampling gives up after this many draws and accepts a repeat;
+# only matters when the recent variants hold nearly all of the weight.
+MAX_REJECTED_DRAWS = 32
+
+
+def build_alias_table(weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Select a Variant using weighted random by score.
-    Expects (variant, weight) pairs with weight >= 0.
+    Vose's alias method. Returns (prob, alias) so that picking a uniform
+    column i and keeping it with probability prob[i] (else taking alias[i])
+    samples proportionally to `weights`.
     """
-    variants: List[Variant] = []
-    cumulative: List[float] = []
-    total = 0.0
-
-    for v, w in items:
-        if w <= 0.0:
-            continue
-        total += w
-        variants.append(v)
-        cumulative.append(total)
-
-    if total == 0.0 or not variants:
-        raise Exception("No displayable images with positive score.")
-
-    r = random.random() * total
-    idx = bisect(cumulative, r)
-    return variants[idx]
-
-def get_variant():
-    qs = Variant.objects.only(
-        "id", "path", "score", "favourite", "created_at"
-    ).filter(path__isnull=False).order_by("-score")[:10000]
-    if not qs.exists():
-        raise Exception("No images available.")
-    
-
-    now = timezone.now()
-    pairs: List[Tuple[Variant, float]] = []
-    for v in qs.iterator():
-        # v.score is your persisted static score
-        final_score = calculate_final_score(
-            static_score=float(v.score or 0.0),
-            favourite=bool(v.favourite),
-            created_at=v.created_at,
+    n = len(weights)
+    prob = np.zeros(n, dtype=np.float64)
+    alias = np.zeros(n, dtype=np.int64)
+    scaled = (weights * (n / weights.sum())).tolist()
+
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        s, l = small.pop(), large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] = (scaled[l] + scaled[s]) - 1.0
+        (small if scaled[l] < 1.0 else large).append(l)
+    # Leftovers are 1.0 up to rounding error
+    for i in large + small:
+        prob[i] = 1.0
+        alias[i] = i
+    return prob, alias
+
+
+@dataclass(frozen=True)
+class _SamplerTable:
+    ids: np.ndarray  # int64, variant pks
+    prob: np.ndarray  # float64, alias acceptance probability per column
+    alias: np.ndarray  # int64, fallback column
+    fingerprint: Tuple
+    built_at: float  # wall clock, seconds
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def draw(self, rng: np.random.Generator) -> int:
+        """O(1): one uniform column plus one coin flip."""
+        i = int(rng.integers(len(self.ids)))
+        if rng.random() >= self.prob[i]:
+            i = int(self.alias[i])
+        return int(self.ids[i])
+
+
+class VariantSampler:
+    """
+    Weighted random choice of a Variant by final score.
+
+    Final scores are computed for all candidates at once with NumPy and kept as
+    an alias table shared by all displays, so a draw is O(1) instead of an ORM
+    scan. The table is rebuilt when Variants change or novelty decay has
+    drifted past NOVELTY_TOLERANCE.
+
+    Each display keeps a short in-process history of what it was shown;
+    recent variants are rejected and redrawn. The history lives in this
+    process only, so a display served by several workers may occasionally
+    see a repeat.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._table: Optional[_SamplerTable] = None
+        self._rng = np.random.default_rng()
+        self._history: Dict[int, Deque[int]] = {}
+        self._checked_at = 0.0  # monotonic
+        self._stale_after = novelty_stale_after_seconds(NOVELTY_TOLERANCE)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._table = None
+
+    @staticmethod
+    def _fingerprint() -> Tuple:
+        agg = Variant.objects.filter(path__isnull=False).aggregate(
+            n=Count("id"), last_id=Max("id"), last_update=Max("updated_at"),
+        )
+        return (agg["n"], agg["last_id"], agg["last_update"])
+
+    @staticmethod
+    def _build(fingerprint: Tuple) -> _SamplerTable:
+        rows = list(
+            Variant.objects
+            .filter(path__isnull=False)
+            .order_by("-score")
+            .values_list("id", "score", "favourite", "created_at")[:MAX_SAMPLED_VARIANTS]
         )
-        pairs.append((v, final_score))
+        now = time.time()
+        if not rows:
+            empty = np.empty(0)
+            return _SamplerTable(empty.astype(np.int64), empty, empty.astype(np.int64), fingerprint, now)
+
+        ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+        static = np.fromiter((float(r[1] or 0.0) for r in rows), dtype=np.float64, count=len(rows))
+        favourites = np.fromiter((bool(r[2]) for r in rows), dtype=bool, count=len(rows))
+        created = np.fromiter((r[3].timestamp() for r in rows), dtype=np.float64, count=len(rows))
+
+        weights = calculate_final_scores(static, favourites, created, now)
+        if weights.sum() <= 0.0:
+            raise Exception("No displayable images with positive score.")
+        prob, alias = build_alias_table(weights)
+        return _SamplerTable(ids, prob, alias, fingerprint, now)
+
+    def _current(self) -> _SamplerTable:
+        with self._lock:
+            table = self._table
+            mono = time.monotonic()
+            if table is not None and time.time() - table.built_at > self._stale_after:
+                table = None
+            if table is not None and mono - self._checked_at >= FINGERPRINT_CHECK_SECS:
+                self._checked_at = mono
+                if self._fingerprint() != table.fingerprint:
+                    table = None
+            if table is None:
+                self._checked_at = mono
+                table = self._build(self._fingerprint())
+                self._table = table
+            return table
+
+    def _recent(self, display_id: int) -> Deque[int]:
+        recent = self._history.get(display_id)
+        if recent is None:
+            recent = self._history[display_id] = deque(maxlen=RECENT_HISTORY_SIZE)
+        return recent
 
-    return _weighted_choice(pairs)
+    def sample_id(self, display_id: Optional[int] = None) -> int:
+        table = self._current()
+        if not len(table):
+            raise Exception("No images available.")
+        with self._lock:
+            if display_id is None:
+                return table.draw(self._rng)
 
+            recent = self._recent(display_id)
+            # Never exclude everything: keep at least one variant drawable
+            window = min(len(recent), len(table) - 1)
+            excluded = set(list(recent)[len(recent) - window:]) if window else set()
+            for _ in range(MAX_REJECTED_DRAWS):
+                chosen = table.draw(self._rng)
+                if chosen not in excluded:
+                    break
+            recent.append(chosen)
+            return chosen
+
+
+_sampler = VariantSampler()
+
+
+@receiver(post_save, sender=Variant)
+@receiver(post_delete, sender=Variant)
+def _invalidate_sampler(sender, **kwargs):
+    _sampler.invalidate()
+
+
+def get_variant(display: Optional["Display"] = None) -> Variant:
+    """
+    Weighted random Variant. With a display, variants it was shown recently
+    are avoided.
+    """
+    display_id = display.pk if display is not None else None
+    variant = Variant.objects.filter(pk=_sampler.sample_id(display_id)).first()
+    if variant is None:
+        # Deleted by another process since the table was built
+        _sampler.invalidate()
+        variant = Variant.objects.filter(pk=_sampler.sample_id(display_id)).first()
+    if variant is None:
+        # Same failure as an empty table; callers report "no variants"
+        raise Exception("No images available.")
+    return variant
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import mimetypes
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+from urllib.parse import quote
+
+from django.conf import settings
+from django.db import models
+from django.http import FileResponse, HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from dashboard.constants import CACHE_DIR, IMAGE_DIR
+from dashboard.services.file_index import sha256_file
+
+# Frames may keep a copy but must ask every time; unchanged images then cost a 304
+IMAGE_CACHE_CONTROL = "no-cache"
+
+
+def ensure_etag(obj: models.Model, path_field: str = "path") -> Optional[str]:
+    """
+    The content hash of an image row (Variant, PrerenderedDashboard), computed
+    and stored on first use for rows made before ETags were recorded.
+    `update()` keeps updated_at and post_save listeners out of it.
+    """
+    etag = getattr(obj, "etag", None)
+    path = getattr(obj, path_field, None)
+    if etag or not path:
+        return etag
+    try:
+        etag = sha256_file(path)
+    except FileNotFoundError:
+        return None
+    type(obj).objects.filter(pk=obj.pk).update(etag=etag)
+    obj.etag = etag
+    return etag
+
+
+def _x_accel_roots() -> List[Tuple[Path, str]]:
+    return [
+        (IMAGE_DIR.resolve(), settings.X_ACCEL_IMAGE_PREFIX),
+        (CACHE_DIR.resolve(), settings.X_ACCEL_CACHE_PREFIX),
+    ]
+
+
+def x_accel_uri(path: Path) -> Optional[str]:
+    """The nginx internal URI for `path`, or None when it lies outside the mapped roots."""
+    resolved = path.resolve()
+    for root, prefix in _x_accel_roots():
+        if resolved.is_relative_to(root):
+            return prefix + quote(resolved.relative_to(root).as_posix())
+    return None
+
+
+def serve_image(
+    request: HttpRequest,
+    path: Union[str, Path],
+    *,
+    etag: Optional[str] = None,
+    content_type: Optional[str] = None,
+) -> HttpResponse:
+    """
+    Serve an image file with ETag and Last-Modified. A request whose
+    If-None-Match (or If-Modified-Since) still matches gets a 304 without
+    the file being opened. Without a stored content hash, size and mtime
+    stand in as a weak ETag.
+
+    With SERVE_FILES_WITH_X_ACCEL the body is left to nginx: the response
+    only carries headers and an X-Accel-Redirect to the file, so the worker
+    is free right away and nginx sends it with sendfile.
+    """
+    path = Path(path)
+    try:
+        st = path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        return HttpResponse(status=404)
+    quoted = quote_etag(etag) if etag else f'W/"{st.st_size:x}-{st.st_mtime_ns:x}"'
+    last_modified = int(st.st_mtime)
+
+    response = get_conditional_response(request, etag=quoted, last_modified=last_modified)
+    if response is None:
+        if content_type is None:
+            content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        uri = x_accel_uri(path) if settings.SERVE_FILES_WITH_X_ACCEL else None
+        if uri is not None:
+            response = HttpResponse(content_type=content_type)
+            response["X-Accel-Redirect"] = uri
+        else:
+            response = FileResponse(open(path, "rb"), content_type=content_type)
+            response["Content-Length"] = str(st.st_size)
+    response["ETag"] = quoted
+    response["Last-Modified"] = http_date(last_modified)
+    response["Cache-Control"] = IMAGE_CACHE_CONTROL
+    return response
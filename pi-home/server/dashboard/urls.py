@@ -2,7 +2,7 @@ from django.urls import path
 from dashboard.views.dashboard import DashboardView
 from dashboard.views.home import HomeView
 from dashboard.views.photo import PhotoView
-from dashboard.views.display_service import DisplayDashboardView, DisplayVariantView, DisplayBootScreenView
+from dashboard.views.display_service import DisplayDashboardView, DisplayVariantView, DisplayBootScreenView, DisplayNextView
 from dashboard.views.info_screens import BootScreenView
 
 urlpatterns = [
@@ -13,5 +13,6 @@ urlpatterns = [
     # path("api/display/json/", DisplayJsonView.as_view(), name="display-json"),
     path("api/display/variant", DisplayVariantView.as_view(), name="display-image"),
     path("api/display/dashboard", DisplayDashboardView.as_view(), name="display-image"),
+    path("api/display/next", DisplayNextView.as_view(), name="display-next"),
     path("api/display/bootstrap", DisplayBootScreenView.as_view(), name="display-bootstrap"),
 ]
@@ -8,6 +8,8 @@ from django.shortcuts import render
 from django.views import View
 from django.utils import timezone
 from django.db.models import Prefetch
+from django.http import JsonResponse
+from pydantic import BaseModel, Field, ValidationError
 from dashboard.services.util import convert_unix_dt_to_datetime, local_date, bytes_to_size_notation
 from dashboard.models.weather import DayForecast, Location, WeatherDetail
 from dashboard.models.application import MinuteSystemSample
@@ -146,6 +148,12 @@ class DashboardViewData:
     docker: DashboardDockerHealthView | None
     calendar: DashboardCalendarView | None
 
+class DashboardQueryParams(BaseModel):
+    # Page geometry; the browser renderer sets these to the target display's resolution
+    w: int = Field(default=1200, gt=0, lt=5000)
+    h: int = Field(default=1600, gt=0, lt=5000)
+
+
 class DashboardView(View):
 
     def get_header(self,now: datetime) -> DashboardHeaderView:
@@ -349,10 +357,11 @@ class DashboardView(View):
             containers=containers, # Value from service already view suitable
         )
     
-    def get(self, request):
-        now_minute = timezone.now().replace(second=0, microsecond=0)
+    def build_view_data(self, now: datetime) -> DashboardViewData:
+        """Everything the dashboard shows; shared by the HTML page and the Pillow renderer."""
+        now_minute = now.replace(second=0, microsecond=0)
         # Get alerts; for now empty list
-        view_data = DashboardViewData(
+        return DashboardViewData(
             header = self.get_header(now_minute),
             stats=self.get_stats(now_minute),
             # docker=self.get_docker(now_minute),
@@ -361,4 +370,17 @@ class DashboardView(View):
             disks=self.get_disks(now_minute),
             calendar=self.get_calendar(now_minute)
         )
-        return render(request, "dashboard/dashboard.html", context=asdict(view_data))
+
+    def get(self, request):
+        try:
+            params = DashboardQueryParams.model_validate(request.GET.dict())
+        except ValidationError as e:
+            return JsonResponse(
+                {"detail": "Invalid query parameters", "errors": e.errors()},
+                status=400,
+            )
+        view_data = self.build_view_data(timezone.now())
+        context = asdict(view_data)
+        context["screen_width"] = params.w
+        context["screen_height"] = params.h
+        return render(request, "dashboard/dashboard.html", context=context)
@@ -10,22 +10,21 @@ from dashboard.models.schedule import Display
 from pathlib import Path
 from dashboard.models.application import PrerenderedDashboard
 from dashboard.models.schedule import WeeklyRule
-from dashboard.constants import ModeKind
+from dashboard.constants import DASHBOARD_MODE, MIN_SLEEP_SECS, MODE_REFRESH_SECS, PHOTO_MODE, ModeKind
+from dashboard.models.photos import Variant
 from dashboard.services.select_image import get_variant
 from dashboard.services.display import create_new_display
-from dashboard.services.render_page import render_png, run_eink_pipeline_for_page_in_memory
+from dashboard.services.bootscreen import get_bootscreen_png
+from dashboard.services.serve_file import ensure_etag, serve_image
+from dashboard.services.heartbeat import record_heartbeat
 from pydantic import BaseModel, ValidationError, Field
 from typing import Literal, Annotated, TypeAlias
 from dataclasses import dataclass, asdict
-import io
+from datetime import datetime, timedelta
 
 
-def _get_file_response(path: str | Path):
-    normalisedPath = Path(path)
-    if not normalisedPath.exists():
-        return HttpResponse(status=404)
-    response = FileResponse(open(normalisedPath, "rb"), content_type="image/png")
-    response["Cache-Control"] = "no-store"
+def _get_file_response(request: HttpRequest, path: str | Path, etag: str | None = None):
+    return serve_image(request, path, etag=etag, content_type="image/png")
 
 ResolutionDimension: TypeAlias = Annotated[int, Field(gt=0, lt=5000)] 
 
@@ -83,8 +82,7 @@ class DisplayButtonController(APIView):
 
     def post(self, request):
         display = request.user.display
-        display.last_seen = timezone.now()
-        display.save(update_fields=["last_seen"])
+        record_heartbeat(display, request)
 
         try:
             body = ButtonRequestBody.model_validate(request.data)
@@ -100,66 +98,121 @@ class DisplayButtonController(APIView):
         return Response({"ok": True, "button": pressed}, status=status.HTTP_200_OK)
 
 
+def _dashboard_for(display: Display) -> PrerenderedDashboard:
+    """
+    Latest pregenerated dashboard made for this display's geometry, palette
+    and renderer, or else the latest rendered one. Rows whose render has not
+    finished (no path yet) are skipped. Raises PrerenderedDashboard.DoesNotExist.
+    """
+    latest = (
+        PrerenderedDashboard.objects.filter(
+            width=display.x_res,
+            height=display.y_res,
+            palette=display.palette,
+            renderer=display.dashboard_renderer,
+        ).exclude(path=None).order_by("-created_at").first()
+        # Not rendered for it yet (new display, changed settings)
+        or PrerenderedDashboard.objects.exclude(path=None).latest("created_at")
+    )
+    return latest
+
+
+def _variant_for(display: Display) -> Variant:
+    """A variant to show on this display. Raises RuntimeError."""
+    try:
+        variant = get_variant(display)
+    except Exception:
+        raise RuntimeError("No variants have been generated. Is the variant creation job running and are source present?")
+    if not variant.path:
+        raise RuntimeError("Variant did not hava path; therefore its generation process failed. Check the variant generation job logs.")
+    return variant
+
+
+def _sleep_until(display: Display, mode: ModeKind, now: datetime) -> datetime:
+    """
+    When the frame should ask again: the next start or end of a schedule
+    window or the override expiry, but no later than the mode's refresh
+    interval and no sooner than MIN_SLEEP_SECS.
+    """
+    candidates = [now + timedelta(seconds=MODE_REFRESH_SECS[mode])]
+    boundary = WeeklyRule.next_change_for_display(display, now.astimezone(display.tz))
+    if boundary is not None:
+        candidates.append(boundary)
+    if display.override_mode and display.override_expires_at:
+        candidates.append(display.override_expires_at)
+    return max(min(candidates), now + timedelta(seconds=MIN_SLEEP_SECS))
+
+
 class DisplayDashboardView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        now = timezone.now()
         display = request.user.display
-        display.last_seen = now
-        display.save(update_fields=["last_seen"])
-        # Get latest pregenerated dashboad
+        record_heartbeat(display, request)
         try:
-            latest = PrerenderedDashboard.objects.latest("created_at")
-            if not latest.path:
-                raise RuntimeError("Generated dashboard record found but no associated image was generated.")
+            latest = _dashboard_for(display)
         except PrerenderedDashboard.DoesNotExist:
-            return HttpResponseServerError("No dashboard records exist. Is the generation job running?")
+            return HttpResponseServerError("No dashboard has been rendered yet. Is the generation job running?")
+        # Unchanged dashboards hash the same, so a frame that has it gets a 304
+        return _get_file_response(request, latest.path, ensure_etag(latest))
+    
+class DisplayVariantView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        display = request.user.display
+        record_heartbeat(display, request)
+        try:
+            variant = _variant_for(display)
         except RuntimeError as e:
             return HttpResponseServerError(str(e))
-        out_path = Path(latest.path)
+        return _get_file_response(request, variant.path, ensure_etag(variant))
 
-        response = _get_file_response(out_path)
-        if not isinstance(response, FileResponse):
-            return response
-        # Response is an image
-        response["Cache-Control"] = "no-store"
-        return response
-    
-class DisplayVariantView(APIView):
+class DisplayNextView(APIView):
+    """
+    Whatever the display should show right now, according to its override
+    and weekly schedule, plus when to ask again:
+
+    - X-Display-Mode: the mode the image belongs to
+    - X-Sleep-Until: ISO 8601 time of the next wake-up
+    - X-Sleep-Seconds: the same, relative to this response
+
+    A 304 carries the same headers, so a frame can go back to sleep without
+    downloading anything.
+    """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        now = timezone.now()
         display = request.user.display
-        display.last_seen = now
-        display.save(update_fields=["last_seen"])
+        record_heartbeat(display, request)
+        now = timezone.now()
+        mode = WeeklyRule.resolve_mode(display, now)
         try:
-            variant = get_variant()
-        except:
-            return HttpResponseServerError("No variants have been generated. Is the variant creation job running and are source present?")
-        if not variant.path:
-            return HttpResponseServerError("Variant did not hava path; therefore its generation process failed. Check the variant generation job logs.")
-        response = _get_file_response(variant.path)
-        if not isinstance(response, FileResponse):
-            return response
-        # Response is an image
-        response["Cache-Control"] = "no-store"
+            if mode == DASHBOARD_MODE:
+                image = _dashboard_for(display)
+            else:
+                # There is no newspaper content yet; show a photo instead
+                image = _variant_for(display)
+                mode = PHOTO_MODE
+        except PrerenderedDashboard.DoesNotExist:
+            return HttpResponseServerError("No dashboard has been rendered yet. Is the generation job running?")
+        except RuntimeError as e:
+            return HttpResponseServerError(str(e))
+
+        response = _get_file_response(request, image.path, ensure_etag(image))
+        sleep_until = _sleep_until(display, mode, now)
+        response["X-Display-Mode"] = mode
+        response["X-Sleep-Until"] = sleep_until.astimezone(display.tz).isoformat(timespec="seconds")
+        response["X-Sleep-Seconds"] = str(int((sleep_until - now).total_seconds()))
         return response
     
 class DisplayBootScreenView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        now = timezone.now()
         display = request.user.display
-        display.last_seen = now
-        display.save(update_fields=["last_seen"])
-        png = render_png(f"http://localhost:8000/bootstrap?pk={display.pk}") # TODO remove hardcoded value. Relative URL
-        buffer = io.BytesIO(png)
-        buffer.seek(0)
-        out_buffer = run_eink_pipeline_for_page_in_memory(buffer.getvalue())
-        response = FileResponse(out_buffer,content_type="image/png")
-        response["Cache-Control"] = "no-store"
-        return response
+        record_heartbeat(display, request)
+        path = get_bootscreen_png(display)
+        # Content addressed: the file name is already a hash of what it shows
+        return _get_file_response(request, path, path.stem)
         
\ No newline at end of file
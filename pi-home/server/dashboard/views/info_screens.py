@@ -51,7 +51,23 @@ class BootScreenData:
 
 class BootstrapRequestURLQueryParams(BaseModel):
     pk: int
-    
+
+
+def get_bootscreen_data(display: Display) -> BootScreenData:
+    return BootScreenData(
+        updated_at=timezone.localtime(),
+        bootinfo=[
+            KeyValue("Hostname", display.host),
+            KeyValue("Horizontal resolution", str(display.x_res) + " px"),
+            KeyValue("Vertical resolution", str(display.y_res) + " px"),
+            KeyValue("Hardware ID", display.hardware_id),
+            KeyValue("Human readable ID", display.human_readable_id),
+            KeyValue("Default mode", display.default_mode),
+            KeyValue("Display server hostname", socket.gethostname()),
+            KeyValue("Display server LAN IP's", ",".join(get_all_lan_ips())),
+        ]
+    )
+
 
 class BootScreenView(View):
     def get(self, request):
@@ -72,18 +88,5 @@ class BootScreenView(View):
                 status=404,
             )
 
-        view_data = BootScreenData(
-            updated_at=timezone.localtime(),
-            bootinfo=[
-                KeyValue("Hostname", display.host),
-                KeyValue("Horizontal resolution", str(display.x_res) + " px"),
-                KeyValue("Vertical resolution", str(display.y_res) + " px"),
-                KeyValue("Hardware ID", display.hardware_id),
-                KeyValue("Human readable ID", display.human_readable_id),
-                KeyValue("Default mode", display.default_mode),
-                KeyValue("Display server hostname", socket.gethostname()),
-                KeyValue("Display server LAN IP's", ",".join(get_all_lan_ips())),
-            ]
-        )
-
+        view_data = get_bootscreen_data(display)
         return render(request, "dashboard/bootstrap.html", context=asdict(view_data))
\ No newline at end of file
@@ -1,9 +1,9 @@
 from django.shortcuts import render
 from django.views import View
 from dashboard.services.select_image import get_variant
-from django.http import FileResponse, Http404
+from dashboard.services.serve_file import ensure_etag, serve_image
+from django.http import Http404
 import os
-import mimetypes
 
 class PhotoView(View):
 
@@ -20,10 +20,5 @@ class PhotoView(View):
         if not path or not os.path.exists(path):
             raise Http404("Image file not found on disk.")
 
-        ctype, _ = mimetypes.guess_type(path)
-        ctype = ctype or "application/octet-stream"
-
-        resp = FileResponse(open(path, "rb"), content_type=ctype)
-        # Dynamic content; avoid caching on the client/display unless you want it
-        resp["Cache-Control"] = "no-store"
-        return resp
+        # Revalidated on every request; a repeat of the same variant is a 304
+        return serve_image(request, path, etag=ensure_etag(chosen))
@@ -79,6 +79,23 @@ WSGI_APPLICATION = 'pihome.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# The SQLite file is shared by gunicorn, the daemon (stats + jobs) and
+# management commands. The "production" profile applies these pragmas on every
+# new connection; "default" is Django's stock SQLite configuration.
+DB_PROFILE = os.getenv(
+    "DB_PROFILE",
+    "default" if os.getenv("ENV", "development") in ("", "development") else "production",
+)
+
+SQLITE_PRODUCTION_PRAGMAS = {
+    "journal_mode": "WAL",      # readers no longer block the writer (and vice versa)
+    "synchronous": "NORMAL",    # durable with WAL; fsync at checkpoints instead of every commit
+    "busy_timeout": 5000,       # ms to wait for the write lock before "database is locked"
+    "mmap_size": 134217728,     # 128 MiB of the file memory-mapped for reads
+    "cache_size": -20000,       # page cache in KiB (negative) per connection
+    "temp_store": "MEMORY",
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
@@ -86,6 +103,20 @@ DATABASES = {
     }
 }
 
+if DB_PROFILE == "production":
+    DATABASES['default'].update({
+        'OPTIONS': {
+            'init_command': "; ".join(f"PRAGMA {k}={v}" for k, v in SQLITE_PRODUCTION_PRAGMAS.items()),
+            # Take the write lock at BEGIN so concurrent writers wait on
+            # busy_timeout instead of failing on a read->write lock upgrade
+            'transaction_mode': 'IMMEDIATE',
+        },
+        # Seconds to keep connections open between requests; 0 closes them
+        # after each request like the default profile
+        'CONN_MAX_AGE': int(os.getenv("DB_CONN_MAX_AGE", "60")),
+        'CONN_HEALTH_CHECKS': True,
+    })
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -147,7 +178,16 @@ if not ENV:
 DEBUG = ENV == "development"
 
 DISCOVERY_PORT = int(os.getenv("DISCOVERY_PORT", 51234))
+JOB_WAKEUP_PORT = int(os.getenv("JOB_WAKEUP_PORT", 51235))  # localhost only; pokes the job daemon
 PUBLIC_BASE_URL = os.getenv("PUBLIC_BASE_URL", "http://localhost:8000")
 
+# Let nginx send image files (X-Accel-Redirect) instead of streaming them through
+# a Django worker. Needs the internal locations and volume mounts of
+# docker/nginx/nginx.conf and docker/docker-compose.yml; leave off when Django
+# is reached without that nginx in front (e.g. runserver).
+SERVE_FILES_WITH_X_ACCEL = os.getenv("SERVE_FILES_WITH_X_ACCEL", "0").lower() in ("1", "true", "yes")
+X_ACCEL_IMAGE_PREFIX = "/_protected/images/"  # maps to IMAGE_DIR
+X_ACCEL_CACHE_PREFIX = "/_protected/cache/"  # maps to CACHE_DIR
+
 ALLOWED_HOSTS = os.getenv("ALLOWED_HOSTS", "localhost,127.0.0.1").split(",")
 CSRF_TRUSTED_ORIGINS = [PUBLIC_BASE_URL] if PUBLIC_BASE_URL.startswith("https") else []